@@ -0,0 +1,146 @@
+import contextlib
+import abc
+import threading
+import numpy
+import time
+import sys
+import os
+
+from .wav_writer import WavWriter
+
+
+@contextlib.contextmanager
+def ignore_stderr():
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    old_stderr = os.dup(2)
+    sys.stderr.flush()
+    os.dup2(devnull, 2)
+    os.close(devnull)
+    try:
+        yield
+    finally:
+        os.dup2(old_stderr, 2)
+        os.close(old_stderr)
+
+
+class Backend(abc.ABC):
+    # callback(frame_count) returns (interleaved float samples, done) and is pulled until done or close()
+    @abc.abstractmethod
+    def open(self, sample_rate, channels, callback, frames_per_buffer=4096):
+        pass
+
+    @abc.abstractmethod
+    def close(self):
+        pass
+
+
+class PyAudioBackend(Backend):
+    def __init__(self):
+        self.pyaudio = None
+        self.stream = None
+
+    def open(self, sample_rate, channels, callback, frames_per_buffer=4096):
+        # Imported here so that PortAudio is only initialized when actually playing through it
+        import pyaudio
+
+        with ignore_stderr():
+            self.pyaudio = pyaudio.PyAudio()
+
+        def stream_callback(in_data, frame_count, time_info, status):
+            data, done = callback(frame_count)
+            return data.astype(numpy.float32, copy=False).tobytes(), pyaudio.paComplete if done else pyaudio.paContinue
+
+        self.stream = self.pyaudio.open(
+            format=pyaudio.paFloat32,
+            channels=channels,
+            rate=sample_rate,
+            output=True,
+            frames_per_buffer=frames_per_buffer,
+            stream_callback=stream_callback
+        )
+
+    def close(self):
+        if self.stream is not None:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.pyaudio.terminate()
+            self.stream = None
+
+
+class ThreadBackend(Backend):
+    # Pulls from the callback on its own thread, like an audio device would
+    def __init__(self):
+        self.thread = None
+        self.closed = False
+
+    def open(self, sample_rate, channels, callback, frames_per_buffer=4096):
+        self.sample_rate = sample_rate
+        self.channels = channels
+        self.closed = False
+        self.thread = threading.Thread(target=self.run, args=(callback, frames_per_buffer),
+                                       name=type(self).__name__, daemon=True)
+        self.thread.start()
+
+    def run(self, callback, frames_per_buffer):
+        done = False
+        while not done and not self.closed:
+            data, done = callback(frames_per_buffer)
+            self.consume(data)
+
+    def consume(self, data):
+        pass
+
+    def close(self):
+        self.closed = True
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+
+
+class NullBackend(ThreadBackend):
+    # Discards audio, but at the pace it would be played
+    def run(self, callback, frames_per_buffer):
+        start = time.monotonic()
+        frames = 0
+        done = False
+        while not done and not self.closed:
+            data, done = callback(frames_per_buffer)
+            frames += len(data) // self.channels
+            delay = start + frames / self.sample_rate - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+
+class FileBackend(ThreadBackend):
+    # Writes audio to a wav file as fast as it is produced
+    def __init__(self, file_name, sample_format='pcm16'):
+        ThreadBackend.__init__(self)
+        self.file_name = file_name
+        self.sample_format = sample_format
+        self.writer = None
+
+    def open(self, sample_rate, channels, callback, frames_per_buffer=4096):
+        self.writer = WavWriter(self.file_name, sample_rate, channels, self.sample_format)
+        ThreadBackend.open(self, sample_rate, channels, callback, frames_per_buffer)
+
+    def consume(self, data):
+        self.writer.write(data.reshape(-1, self.channels))
+
+    def close(self):
+        ThreadBackend.close(self)
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+
+BACKENDS = {
+    'pyaudio': PyAudioBackend,
+    'null': NullBackend,
+    'file': FileBackend,
+}
+
+
+def create_backend(name='pyaudio', *args, **kwargs):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown audio backend: {name}, try one of {list(BACKENDS)}")
+    return BACKENDS[name](*args, **kwargs)
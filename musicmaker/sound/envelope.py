@@ -0,0 +1,63 @@
+import functools
+import threading
+import numpy
+
+from .note_cache import NoteCache
+
+
+class Envelope:
+    # Breakpoints map a position in the note (0.0 to 1.0) to a gain
+    def __init__(self, points):
+        self.points = tuple(sorted(points.items()))
+        self.positions = numpy.array([position for position, _ in self.points], dtype=float)
+        self.gains = numpy.array([gain for _, gain in self.points], dtype=float)
+
+    def __eq__(self, other):
+        return isinstance(other, Envelope) and self.points == other.points
+
+    def __hash__(self):
+        return hash(self.points)
+
+    def __repr__(self):
+        return f"Envelope({dict(self.points)})"
+
+    @staticmethod
+    @functools.lru_cache(256)
+    def compile(points):
+        return Envelope(dict(points))
+
+    @staticmethod
+    def create(points):
+        if isinstance(points, Envelope):
+            return points
+        return Envelope.compile(tuple(sorted(points.items())))
+
+    def curve(self, num_samples, dtype=numpy.float64):
+        return render_curve(self, num_samples, numpy.dtype(dtype))
+
+    def apply(self, data):
+        return data * self.curve(data.shape[-1], data.dtype)
+
+
+# Gain curves are shared between notes, so they are read-only. Each is as long as a note,
+# so the cache is bounded by bytes and curves longer than the whole budget aren't kept
+CURVE_CACHE = NoteCache(16*1024*1024)
+CURVE_CACHE_LOCK = threading.Lock()
+
+
+def render_curve(envelope, num_samples, dtype):
+    key = (envelope, num_samples, dtype)
+    with CURVE_CACHE_LOCK:
+        curve = CURVE_CACHE.get(key)
+    if curve is not None:
+        return curve
+
+    if num_samples == 0:
+        curve = numpy.zeros(0, dtype=dtype)
+    else:
+        positions = numpy.arange(num_samples) * (1.0 / num_samples)
+        if positions[-1] > envelope.positions[-1] or positions[0] < envelope.positions[0]:
+            raise ValueError(f"{envelope} does not cover the whole note")
+        curve = numpy.interp(positions, envelope.positions, envelope.gains).astype(dtype, copy=False)
+    with CURVE_CACHE_LOCK:
+        return CURVE_CACHE.put(key, curve)
@@ -0,0 +1,45 @@
+import numpy
+
+
+class MixBus:
+    # Fragments are placed by sample offset and summed into one preallocated buffer
+    def __init__(self, dtype=numpy.float32, gain=0.25):
+        self.dtype = numpy.dtype(dtype)
+        self.gain = gain
+        self.fragments = []
+        self.length = 0
+
+    def __len__(self):
+        return self.length
+
+    def add(self, data, offset=0):
+        if len(data) == 0:
+            return
+        self.fragments.append((offset, data))
+        self.length = max(self.length, offset + len(data))
+
+    # Extends the mix with silence up to length samples, e.g. for trailing rests
+    def reserve(self, length):
+        self.length = max(self.length, length)
+
+    # Mixes only [start, stop), letting a stream emit blocks before every fragment is known
+    def mix_range(self, start, stop):
+        out = numpy.zeros(stop - start, dtype=self.dtype)
+        for offset, data in self.fragments:
+            low = max(offset, start)
+            high = min(offset + len(data), stop)
+            if low < high:
+                out[low - start:high - start] += data[low - offset:high - offset]
+        out *= self.gain
+        return out
+
+    # Forgets fragments that end before sample, once they have been streamed
+    def discard_before(self, sample):
+        self.fragments = [(offset, data) for offset, data in self.fragments if offset + len(data) > sample]
+
+    def mix(self):
+        out = numpy.zeros(self.length, dtype=self.dtype)
+        for offset, data in self.fragments:
+            out[offset:offset + len(data)] += data
+        out *= self.gain
+        return out
@@ -0,0 +1,59 @@
+import collections
+
+
+class NoteCache:
+    # Keeps rendered note buffers within max_bytes, evicting the least recently used
+    def __init__(self, max_bytes=64*1024*1024):
+        self.max_bytes = max_bytes
+        self.buffers = collections.OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.buffers)
+
+    def __contains__(self, key):
+        return key in self.buffers
+
+    def get(self, key):
+        if key in self.buffers:
+            self.hits += 1
+            self.buffers.move_to_end(key)
+            return self.buffers[key]
+
+        self.misses += 1
+        return None
+
+    def put(self, key, data):
+        # Cached buffers are shared between every use of the note
+        data.flags.writeable = False
+        if data.nbytes > self.max_bytes:
+            return data
+
+        if key in self.buffers:
+            self.nbytes -= self.buffers.pop(key).nbytes
+        self.buffers[key] = data
+        self.nbytes += data.nbytes
+
+        while self.nbytes > self.max_bytes:
+            _, evicted = self.buffers.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+        return data
+
+    def get_else_render(self, key, render):
+        data = self.get(key)
+        if data is None:
+            data = self.put(key, render())
+        return data
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self.buffers.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,248 @@
+import threading
+import numpy
+
+
+class RingBuffer:
+    # Single producer, single consumer; only the producer ever waits
+    def __init__(self, capacity, dtype=numpy.float32):
+        self.data = numpy.zeros(capacity, dtype=dtype)
+        self.capacity = capacity
+        self.read_count = 0
+        self.write_count = 0
+        self.generation = 0  # counts clears, so a writer can tell its samples went stale
+        self.lock = threading.Lock()
+        self.not_full = threading.Condition(self.lock)
+
+    def available(self):
+        return self.write_count - self.read_count
+
+    def space(self):
+        return self.capacity - self.available()
+
+    def clear(self):
+        with self.lock:
+            self.read_count = self.write_count
+            self.generation += 1
+            self.not_full.notify_all()
+
+    # Writes nothing if the buffer was cleared since generation
+    def write(self, samples, timeout=None, generation=None):
+        with self.lock:
+            if self.space() == 0:
+                self.not_full.wait(timeout)
+            if generation is not None and generation != self.generation:
+                return 0
+            count = min(len(samples), self.space())
+            start = self.write_count % self.capacity
+            first = min(count, self.capacity - start)
+            self.data[start:start + first] = samples[:first]
+            self.data[:count - first] = samples[first:count]
+            self.write_count += count
+            return count
+
+    def read(self, count):
+        with self.lock:
+            count = min(count, self.available())
+            start = self.read_count % self.capacity
+            first = min(count, self.capacity - start)
+            out = numpy.concatenate((self.data[start:start + first], self.data[:count - first]))
+            self.read_count += count
+            self.not_full.notify()
+            return out
+
+
+class Playback:
+    # source() returns a fresh iterator of audio blocks each time it is called, interleaved when multichannel
+    def __init__(self, source, sample_rate, loop=False, buffer_frames=65536, prebuffer_frames=16384,
+                 dtype=numpy.float32, channels=1):
+        self.source = source
+        self.sample_rate = sample_rate
+        self.loop = loop
+        self.channels = channels
+        self.ring = RingBuffer(buffer_frames * channels, dtype)
+        self.prebuffer_samples = min(prebuffer_frames, buffer_frames) * channels
+        self.queued = []
+        self.close_callbacks = []
+        self.output = None
+
+        self.lock = threading.Lock()
+        self.ready = threading.Event()
+        self.done = threading.Event()
+        self.stopped = False
+        self.finished = False
+        self.seek_frame = None
+        self.producer = None
+        self.error = None
+
+        # Metrics
+        self.position = 0
+        self.frames_played = 0
+        self.underruns = 0
+        self.underrun_frames = 0
+
+    def on_close(self, callback):
+        self.close_callbacks.append(callback)
+
+    # Has backend pull from callback until done, then closes it on stop
+    def open_output(self, backend, frames_per_buffer=4096):
+        self.output = (backend, frames_per_buffer)
+        backend.open(self.sample_rate, self.channels, self.callback, frames_per_buffer)
+        self.on_close(backend.close)
+
+    def start(self):
+        self.producer = threading.Thread(target=self.produce, name='PlaybackProducer', daemon=True)
+        self.producer.start()
+        self.ready.wait()
+        if self.error is not None:
+            raise self.error
+        return self
+
+    # Queues another source to follow the current one without a gap
+    def queue(self, source):
+        with self.lock:
+            self.queued.append(source)
+
+    def seek(self, frame):
+        # Cleared together with setting seek_frame, so the producer never misses a clear
+        with self.lock:
+            self.seek_frame = frame
+            self.position = frame
+            self.ring.clear()
+            finished = self.finished
+            self.finished = False
+            self.error = None
+            reopen = self.done.is_set() and self.output is not None
+
+        if self.stopped or self.producer is None:
+            return
+
+        # Seeking after the end starts producing again, and playing again if the output already finished
+        if reopen:
+            self.output[0].close()
+        if finished:
+            self.producer.join()
+            self.done.clear()
+            self.ready.clear()
+            self.start()
+        if reopen:
+            backend, frames_per_buffer = self.output
+            backend.open(self.sample_rate, self.channels, self.callback, frames_per_buffer)
+
+    # A failing source ends playback, start and wait raise its error in the caller's thread
+    def produce(self):
+        try:
+            self.produce_blocks()
+        except Exception as error:
+            with self.lock:
+                self.error = error
+                self.finished = True
+            self.ready.set()
+            self.done.set()
+
+    def produce_blocks(self):
+        with self.lock:
+            blocks = iter(self.source())
+            generation = self.ring.generation
+        skip = 0
+        empty = True  # nothing came out of blocks yet
+        while not self.stopped:
+            restart = self.take_seek()
+            if restart is not None:
+                blocks, skip, generation = restart
+                empty = True
+
+            block = next(blocks, None)
+            if block is None:
+                if self.end_pass(empty):
+                    self.ready.set()
+                    break
+                blocks = iter(self.source())
+                empty = True
+                continue
+            empty = empty and len(block) == 0
+
+            if skip > 0:
+                dropped = min(skip, len(block))
+                skip -= dropped
+                block = block[dropped:]
+            self.write_block(block, generation)
+
+    # The blocks, samples to skip and ring generation to go on with after a seek, or None
+    def take_seek(self):
+        with self.lock:
+            if self.seek_frame is None:
+                return None
+            skip = self.seek_frame * self.channels
+            self.seek_frame = None
+            self.finished = False
+            self.ring.clear()
+            return iter(self.source()), skip, self.ring.generation
+
+    # Moves on to the next queued source, returning whether playback has finished
+    def end_pass(self, empty):
+        with self.lock:
+            if self.queued:
+                self.source = self.queued.pop(0)
+            elif (not self.loop or empty) and self.seek_frame is None:
+                # An empty pass would loop forever without playing anything
+                self.finished = True
+            return self.finished
+
+    def write_block(self, block, generation):
+        while len(block) > 0 and not self.stopped and self.seek_frame is None:
+            block = block[self.ring.write(block, 0.1, generation):]
+            if self.ring.available() >= self.prebuffer_samples:
+                self.ready.set()
+
+    # Called by the output with the number of frames it wants, never waits for the producer
+    def callback(self, frame_count):
+        count = frame_count * self.channels
+        data = self.ring.read(count)
+        self.frames_played += len(data) // self.channels
+        self.position += len(data) // self.channels
+
+        if len(data) < count:
+            # The last buffer is left short, anything else missing is padded with silence
+            # Decided under the lock so that a seek either sees the output done or keeps it going
+            with self.lock:
+                ending = self.finished and not self.stopped
+                if ending:
+                    self.done.set()
+            if not ending and not self.stopped:
+                self.underruns += 1
+                self.underrun_frames += frame_count - len(data) // self.channels
+                data = numpy.concatenate((data, numpy.zeros(count - len(data), dtype=data.dtype)))
+
+        return data, self.done.is_set() or self.stopped
+
+    def is_playing(self):
+        return self.producer is not None and not self.done.is_set() and not self.stopped
+
+    def wait(self, timeout=None):
+        # Waiting in slices keeps the caller interruptible
+        while not self.done.wait(0.1 if timeout is None else timeout):
+            if self.stopped or timeout is not None:
+                break
+        if self.error is not None:
+            raise self.error
+        return self.done.is_set()
+
+    def stop(self):
+        self.stopped = True
+        self.ready.set()
+        self.ring.clear()
+        if self.producer is not None and self.producer is not threading.current_thread():
+            self.producer.join()
+        self.done.set()
+        for callback in self.close_callbacks:
+            callback()
+        self.close_callbacks = []
+
+    def metrics(self):
+        return {
+            'position': self.position,
+            'frames_played': self.frames_played,
+            'underruns': self.underruns,
+            'underrun_frames': self.underrun_frames,
+            'buffered': self.ring.available(),
+        }
@@ -1,55 +1,199 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory, resource_tracker
+import multiprocessing
 import argparse
+import numpy
 import sys
 
 from musicmaker.theory.staff import Staff
-from .wav import Wav
+from .mix_bus import MixBus
+from .note_cache import NoteCache
+from .wavetable import WavetableSynth
+from .synth import Synth
+from .timeline import Timeline
+from .wav import Wav, BLOCK_SIZE
 
 
 class StaffPlayer(Wav):
-    def __init__(self, staff, sample_rate=44100):
-        Wav.__init__(self, sample_rate)
+    def __init__(self, staff, sample_rate=44100, cache_bytes=64*1024*1024, dtype=numpy.float32, backend='pyaudio',
+                 tuning=None):
+        Wav.__init__(self, sample_rate, dtype, backend)
         self.staff = staff
+        self.tuning = tuning
         self.sounds = {}
-        self.default_sound = lambda f, d, v: self.synth.clean_ends(self.synth.sine_tone(f, d, v))
+        self.note_cache = NoteCache(cache_bytes)
+        self.wavetable_synth = WavetableSynth(sample_rate, self.dtype)
+        self.default_sound = self.synth.clean_sine
         self.ready = False
 
-    def set_default_sound(self, sound):
+    # Swaps a built-in synth sound for the same sound rendered by wavetable lookup
+    def wavetable_sound(self, sound):
+        if not isinstance(getattr(sound, '__self__', None), Synth):
+            raise ValueError(f"Only built-in synth sounds have a wavetable mode: {sound}")
+        return getattr(self.wavetable_synth, sound.__name__)
+
+    def set_default_sound(self, sound, wavetable=False):
+        if wavetable:
+            sound = self.wavetable_sound(sound)
         self.default_sound = sound
 
-    def add_sound(self, key, sound):
+    def add_sound(self, key, sound, wavetable=False):
+        if wavetable:
+            sound = self.wavetable_sound(sound)
         self.sounds[key] = sound
 
-    def prepare(self):
-        for note_lines in self.staff:
+    # Renders a note group once per distinct (sound, freqs, samples, volume, sample rate)
+    def render(self, freqs, sound, duration_ms, volume=1.0):
+        num_samples = self.synth.num_samples(duration_ms)
+        key = (sound, tuple(freqs), num_samples, volume, self.sample_rate)
+        return self.note_cache.get_else_render(key, lambda: self.synth.chord(freqs, sound, duration_ms, volume))
+
+    def sound_for(self, key):
+        if key in self.sounds:
+            return self.sounds[key]
+        return self.default_sound
+
+    # Renders an event to exactly the samples it spans on the timeline
+    def render_event(self, event):
+        duration_ms = self.synth.duration_ms(event.end - event.start)
+        return self.render(event.freqs, self.sound_for(event.line), duration_ms)
+
+    def timeline(self):
+        return Timeline(self.staff, self.sample_rate, self.tuning)
+
+    # Every line lasts until the end of the staff, even when it finishes with a rest
+    def extend_lines(self, end):
+        for key in self.staff.lines:
+            if key not in self.audio:
+                self.audio[key] = []
+            self.ends[key] = max(self.ends.get(key, 0), end)
+
+    def prepare(self, processes=1, start_method=None):
+        if processes > 1:
+            return self.prepare_parallel(processes, start_method=start_method)
+
+        timeline = self.timeline()
+        for event in timeline:
+            self.place_sound(self.render_event(event), event.start, event.line)
+        self.extend_lines(timeline.end())
 
-            for key in note_lines:
+        self.ready = True
 
-                notes = []
+    # Renders contiguous segments of each line in a process pool, see render_segment.
+    # Workers start the platform's default way unless start_method names another, such as 'fork'
+    def prepare_parallel(self, processes, segments_per_process=4, start_method=None):
+        timeline = self.timeline()
+        lines = {key: list(timeline.line_events(key)) for key in self.staff.lines}
+
+        total_events = sum(len(events) for events in lines.values())
+        segment_size = max(1, -(-total_events // (processes * segments_per_process)))
+        tasks = [(key, events[start:start + segment_size])
+                 for key, events in lines.items() for start in range(0, len(events), segment_size)]
+
+        # Forked workers inherit the player as is, otherwise dill carries over user sounds such as lambdas
+        context = multiprocessing.get_context(start_method)
+        if context.get_start_method() == 'fork':
+            player = self
+        else:
+            import dill
+            player = dill.dumps(self, recurse=True)
+
+        # Workers share our tracker, which then sees their segments unlinked here instead of leaked
+        resource_tracker.ensure_running()
+
+        with ProcessPoolExecutor(processes, context, init_worker, (player,)) as executor:
+            futures = [executor.submit(render_segment, task) for task in tasks]
+            try:
+                for i, (key, _) in enumerate(tasks):
+                    name, size, start = futures[i].result()
+                    self.place_sound(take_segment(name, size, self.dtype), start, key)
+                    futures[i] = None
+            finally:
+                # Don't leave segments of other workers behind when one of them failed
+                for future in futures:
+                    if future is not None and not future.cancelled() and future.exception() is None:
+                        take_segment(*future.result()[:2], self.dtype)
+
+        self.extend_lines(timeline.end())
+        self.ready = True
 
-                length = note_lines[key][1]*60.0*1000.0/self.staff.tempo
+    # Renders the staff just ahead of consumption, yielding blocks no event still to come can reach into.
+    # Stops at the end of the staff, see num_frames
+    def stream(self, block_size=BLOCK_SIZE):
+        timeline = self.timeline()
+        bus = MixBus(self.dtype)
+        emitted = 0
 
-                if key in self.sounds:
-                    sound = self.sounds[key]
-                else:
-                    sound = self.default_sound
+        for event in timeline:
+            # Events arrive in order of start, so everything before this one is final
+            while event.start - emitted >= block_size:
+                yield bus.mix_range(emitted, emitted + block_size)
+                emitted += block_size
+                bus.discard_before(emitted)
 
-                for note in note_lines[key][0]:
-                    if hasattr(note, 'freq'):
-                        notes.append(note.freq())
+            bus.add(self.render_event(event), event.start)
 
-                if len(notes) > 0:
-                    self.append_sound(self.synth.chord(notes, sound, length), key)
-                else:
-                    self.add_rest(length, key)
+        end = timeline.end()
+        while emitted < end:
+            yield bus.mix_range(emitted, min(emitted + block_size, end))
+            emitted += block_size
+            bus.discard_before(emitted)
 
-        self.ready = True
+    # The staff sets the length, sounds ringing on past its end are cut there whether streamed or prepared
+    def num_frames(self):
+        return self.timeline().end()
+
+    def mix(self):
+        return Wav.mix(self)[:self.num_frames()]
+
+    def blocks(self, block_size=BLOCK_SIZE):
+        if self.ready:
+            return Wav.blocks(self, block_size)
+        return self.stream(block_size)
 
     def play(self):
-        if not self.ready:
-            self.prepare()
         Wav.play(self, self.staff.loop)
 
 
+worker_player = None
+
+
+def init_worker(player):
+    global worker_player
+    if isinstance(player, bytes):
+        import dill
+        player = dill.loads(player)
+    worker_player = player
+
+
+def take_segment(name, size, dtype):
+    shm = shared_memory.SharedMemory(name)
+    try:
+        return numpy.ndarray((size,), dtype, shm.buf).copy()
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+# Renders one segment of a line into shared memory, returning its name, length and start sample
+def render_segment(task):
+    key, events = task
+    player = worker_player
+
+    start = events[0].start
+    fragments = [(event.start - start, player.render_event(event)) for event in events]
+
+    # Rests between the events stay zero, shared memory starts out zeroed
+    size = max(offset + len(data) for offset, data in fragments)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, size * player.dtype.itemsize))
+    out = numpy.ndarray((size,), player.dtype, shm.buf)
+    for offset, data in fragments:
+        out[offset:offset + len(data)] += data
+    del out
+    shm.close()
+    return shm.name, size, start
+
+
 if __name__ == '__main__':
 
     from musicmaker.theory.scale import Scale
@@ -63,6 +207,8 @@ if __name__ == '__main__':
                         help='The target mode for the song (e.g. HarmonicMinor, Major, Mixolydian).')
     parser.add_argument('-t', '--tempo', default=60,
                         help='The tempo for the song in beats per minute (e.g. 60).')
+    parser.add_argument('-j', '--processes', type=int, default=1,
+                        help='Render the song ahead of time using this many processes.')
     args = parser.parse_args()
 
     if args.mode in Scale.modes:
@@ -72,11 +218,7 @@ if __name__ == '__main__':
             print('Valid roots are', [root for root in Pitch.notes()])
             sys.exit()
     elif args.mode not in Scale.modes or len(scale.mode.ascending) != 7:
-        modes = []
-        for mode in Scale.modes:
-            if len(Scale.modes[mode].ascending) == 7:
-                modes.append(mode)
-        print('Valid modes are', modes)
+        print('Valid modes are', [mode for mode in Scale.modes if len(Scale.modes[mode].ascending) == 7])
         sys.exit()
 
     staff = Staff(tempo=int(args.tempo))
@@ -95,4 +237,6 @@ if __name__ == '__main__':
     player = StaffPlayer(staff)
     player.add_sound(1, player.synth.chime)
     player.add_sound(2, player.synth.chime_soft)
+    if args.processes > 1:
+        player.prepare(args.processes)
     player.play()
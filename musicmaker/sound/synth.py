@@ -1,61 +1,125 @@
+import threading
 import math
 import numpy
-from scipy import interpolate
 from operator import itemgetter
 
+from .envelope import Envelope
+from .note_cache import NoteCache
+
 # Including techniques from:
 #   https://davywybiral.blogspot.com/2010/09/procedural-music-with-pyaudio-and-numpy.html
 
 
+# Marks an effect as able to render a column of frequencies at once, see Synth.chord
+def vectorized(effect):
+    effect.vectorized = True
+    return effect
+
+
+# Like the envelope curves, bounded by bytes as each is as long as a note
+INDEX_CACHE = NoteCache(16*1024*1024)
+INDEX_CACHE_LOCK = threading.Lock()
+
+
+def sample_indices(num_samples):
+    with INDEX_CACHE_LOCK:
+        indices = INDEX_CACHE.get(num_samples)
+        if indices is None:
+            indices = INDEX_CACHE.put(num_samples, numpy.arange(num_samples))
+    return indices
+
+
+TONGUE_ENVELOPE = Envelope({0.0: 0.0, 0.02: 1.0, 1.0: 1.0})
+RELEASE_ENVELOPE = Envelope({0.0: 1.0, 0.98: 1.0, 1.0: 0.0})
+CLEAN_ENDS_ENVELOPE = Envelope({0.0: 0.0, 0.02: 1.0, 0.98: 1.0, 1.0: 0.0})
+CHIME_ENVELOPE = Envelope({0.0: 0.0, 0.005: 1.0, 0.25: 0.5, 0.9: 0.1, 1.0: 0.0})
+CHIME_SOFT_ENVELOPE = Envelope({0.0: 0.0, 0.5: 0.75, 0.8: 0.4, .98: 0.1, 1.0: 0.0})
+
+
 class Synth:
-    def __init__(self, sample_rate):
+    def __init__(self, sample_rate, dtype=numpy.float32):
         self.sample_rate = sample_rate
+        self.dtype = numpy.dtype(dtype)
+
+    def num_samples(self, duration_ms):
+        return int(self.sample_rate * (duration_ms / 1000.0))
 
+    # The duration whose num_samples is exactly num_samples, aimed mid sample to survive float rounding
+    def duration_ms(self, num_samples):
+        return (num_samples + 0.5) * 1000.0 / self.sample_rate
+
+    # Effects below broadcast over leading axes, so data may be (notes x samples)
     def shape(self, data, points, kind='slinear'):
-        items = points.items()
-        sorted(items, key=itemgetter(0))
+        if kind in ['linear', 'slinear']:
+            return Envelope.create(points).apply(data)
+
+        # Other kinds of interpolation are rare enough to not warrant caching
+        from scipy import interpolate
+
+        items = sorted(points.items(), key=itemgetter(0))
         keys = list(map(itemgetter(0), items))
         vals = list(map(itemgetter(1), items))
         interp = interpolate.interp1d(keys, vals, kind=kind)
-        factor = 1.0 / len(data)
-        shape = interp(numpy.arange(len(data)) * factor)
-        return data * shape
+        factor = 1.0 / data.shape[-1]
+        shape = interp(sample_indices(data.shape[-1]) * factor)
+        return data * shape.astype(data.dtype, copy=False)
 
     def tongue(self, data):
-        return self.shape(data, {0.0: 0.0, 0.02: 1.0, 1.0: 1.0})
+        return TONGUE_ENVELOPE.apply(data)
 
     def release(self, data):
-        return self.shape(data, {0.0: 1.0, 0.98: 1.0, 1.0: 0.0})
+        return RELEASE_ENVELOPE.apply(data)
 
     def clean_ends(self, data):
-        return self.shape(data, {0.0: 0.0, 0.02: 1.0, 0.98: 1.0, 1.0: 0.0})
+        return CLEAN_ENDS_ENVELOPE.apply(data)
 
+    @vectorized
     def sine_tone(self, freq=440.0, duration_ms=1000, volume=1.0):
-        num_samples = int(self.sample_rate * (duration_ms / 1000.0))
+        num_samples = self.num_samples(duration_ms)
         factor = freq * (math.pi * 2.0) / self.sample_rate
-        return numpy.sin(numpy.arange(num_samples) * factor) * 0.2
+        phase = sample_indices(num_samples) * factor
+        if self.dtype != phase.dtype:
+            # Wrap while still in double precision so narrower types keep their accuracy on long notes
+            phase = numpy.remainder(phase, math.pi * 2.0, out=phase).astype(self.dtype)
+        return numpy.sin(phase, out=phase) * 0.2
+
+    @vectorized
+    def clean_sine(self, freq=440.0, duration_ms=1000, volume=1.0):
+        return self.clean_ends(self.sine_tone(freq, duration_ms, volume))
 
+    @vectorized
     def harmonics(self, freq, duration_ms=1000, volume=1.0):
         a = self.sine_tone(freq, duration_ms, volume)
         b = self.sine_tone(freq*2.0, duration_ms, volume) * 0.5
         c = self.sine_tone(freq*4.0, duration_ms, volume) * 0.125
         return a + b + c
 
+    @vectorized
     def harmonics_soft(self, freq, duration_ms=1000, volume=1.0):
         a = self.sine_tone(freq, duration_ms, volume)
         b = self.sine_tone(freq*2.0, duration_ms, volume) * 0.5
         return a + b
 
+    @vectorized
     def chime(self, freq, duration_ms=1000, volume=1.0):
         chunk = self.harmonics(freq, duration_ms, volume)
-        return self.shape(chunk, {0.0: 0.0, 0.005: 1.0, 0.25: 0.5, 0.9: 0.1, 1.0: 0.0})
+        return CHIME_ENVELOPE.apply(chunk)
 
+    @vectorized
     def chime_soft(self, freq, duration_ms=1000, volume=1.0):
         chunk = self.harmonics_soft(freq, duration_ms, volume)
-        return self.shape(chunk, {0.0: 0.0, 0.5: 0.75, 0.8: 0.4, .98: 0.1, 1.0: 0.0})
+        return CHIME_SOFT_ENVELOPE.apply(chunk)
 
     def chord(self, freqs, effect, duration_ms=1000, volume=1.0):
+        if len(freqs) > 1 and getattr(effect, 'vectorized', False):
+            return self.batch_chord(freqs, effect, duration_ms, volume)
+
         data = effect(freqs[0], duration_ms, volume)
         for freq in freqs[1:]:
             data += effect(freq, duration_ms, volume)
         return data
+
+    # Renders all notes as one (notes x samples) block, summing rows in the same order as chord
+    def batch_chord(self, freqs, effect, duration_ms=1000, volume=1.0):
+        column = numpy.asarray(freqs, dtype=numpy.float64).reshape(-1, 1)
+        return effect(column, duration_ms, volume).sum(axis=0)
@@ -0,0 +1,66 @@
+import collections
+import numpy
+
+from musicmaker.theory.pitch_array import PitchArray
+
+# A sounding note group of one staff line, spanning samples [start, end)
+Event = collections.namedtuple('Event', ['start', 'end', 'line', 'freqs'])
+
+
+class Timeline:
+    # Positions come from each note's cumulative beat, so rounding never adds up along a line
+    # Notes are equal tempered for their own reference pitch, unless a Tuning is given
+    def __init__(self, staff, sample_rate, tuning=None):
+        self.index = staff.index()
+        self.sample_rate = sample_rate
+        self.tuning = tuning
+        self.samples_per_beat = sample_rate * 60.0 / staff.tempo
+        self.freqs = None
+        self.slices = {}  # id of a staff event -> its notes' [start, stop) in freqs
+
+    def sample(self, beat):
+        return int(round(beat * self.samples_per_beat))
+
+    # The frequencies of every note of the index from one table lookup per reference pitch, see PitchArray
+    def compile_freqs(self):
+        notes = []
+        for staff_event in self.index:
+            start = len(notes)
+            notes.extend(note for note in staff_event.notes if hasattr(note, 'value'))
+            self.slices[id(staff_event)] = (start, len(notes))
+
+        midi = numpy.array([note.value for note in notes], dtype=numpy.int16)
+        if self.tuning is not None:
+            self.freqs = PitchArray(midi).freqs(self.tuning)
+            return
+        references = numpy.array([note.tuning for note in notes])
+        self.freqs = numpy.zeros(len(notes))
+        for reference in numpy.unique(references):
+            same = references == reference
+            self.freqs[same] = PitchArray(midi[same], reference.item()).freqs()
+
+    # Rests have no event, they only leave a gap
+    def event(self, staff_event):
+        if self.freqs is None:
+            self.compile_freqs()
+        start, stop = self.slices[id(staff_event)]
+        if stop > start:
+            return Event(self.sample(staff_event.onset), self.sample(staff_event.end), staff_event.line,
+                         self.freqs[start:stop].tolist())
+        return None
+
+    def line_events(self, key):
+        for staff_event in self.index.line_events[key]:
+            event = self.event(staff_event)
+            if event is not None:
+                yield event
+
+    # Events of all lines ordered by start, converted as they are consumed
+    def __iter__(self):
+        for staff_event in self.index:
+            event = self.event(staff_event)
+            if event is not None:
+                yield event
+
+    def end(self):
+        return self.sample(self.index.total_beats)
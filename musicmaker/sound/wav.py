@@ -1,136 +1,115 @@
-import contextlib
 import argparse
-import pyaudio
-import struct
 import numpy
-import wave
 import sys
-import os
 
+from .backend import create_backend, BACKENDS
+from .mix_bus import MixBus
+from .playback import Playback
 from .synth import Synth
+from .wav_reader import WavReader
+from .wav_writer import WavWriter
 
-
-@contextlib.contextmanager
-def ignore_stderr():
-    devnull = os.open(os.devnull, os.O_WRONLY)
-    old_stderr = os.dup(2)
-    sys.stderr.flush()
-    os.dup2(devnull, 2)
-    os.close(devnull)
-    try:
-        yield
-    finally:
-        os.dup2(old_stderr, 2)
-        os.close(old_stderr)
+BLOCK_SIZE = 4096
 
 
 class Wav:
-    def __init__(self, sample_rate=44100):
-        self.audio = {}
+    def __init__(self, sample_rate=44100, dtype=numpy.float32, backend='pyaudio'):
+        self.audio = {}  # channel -> [(sample offset, samples)]
+        self.ends = {}  # channel -> sample offset where the next appended sound starts
         self.sample_rate = sample_rate
-        self.synth = Synth(sample_rate)
+        self.dtype = numpy.dtype(dtype)
+        self.synth = Synth(sample_rate, self.dtype)
+        self.backend = backend
+
+    def clear(self):
+        self.audio = {}
+        self.ends = {}
 
+    # Rests only move the channel along, the mix fills the gap with silence
     def add_rest(self, duration_ms=500, channel='__default__'):
-        num_samples = int(self.sample_rate * (duration_ms / 1000.0))
+        self.add_silence(self.synth.num_samples(duration_ms), channel)
+
+    def add_silence(self, num_samples, channel='__default__'):
         if channel not in self.audio:
             self.audio[channel] = []
-        self.audio[channel].append(numpy.zeros(num_samples))
+        self.ends[channel] = self.ends.get(channel, 0) + num_samples
 
     def append_sound(self, audio, channel='__default__'):
+        self.place_sound(audio, self.ends.get(channel, 0), channel)
+
+    # Places a sound at an absolute sample offset, independent of what came before it on the channel
+    def place_sound(self, audio, offset, channel='__default__'):
         if channel not in self.audio:
             self.audio[channel] = []
-        self.audio[channel].append(audio)
-
-    def save(self, file_name):
-        wav_file = wave.open(file_name, 'w')
-
-        nchannels = 1
-        sampwidth = 2
-        nframes = len(self.audio)
-        comptype = 'NONE'
-        compname = 'not compressed'
-        wav_file.setparams((nchannels, sampwidth, self.sample_rate, nframes, comptype, compname))
+        audio = numpy.asarray(audio, dtype=self.dtype)
+        self.audio[channel].append((offset, audio))
+        self.ends[channel] = max(self.ends.get(channel, 0), offset + len(audio))
 
-        chunk_dict = {}
+    def mix(self):
+        bus = MixBus(self.dtype)
         for channel in self.audio:
-            chunk_dict[channel] = numpy.concatenate(self.audio[channel]) * 0.25
-        vals = list(chunk_dict.values())
-        chunk = vals[0]
-        for val in vals[1:]:
-            chunk += val
-
-        # (short) 16-bit signed integers for the sample size
-        #   [32767 is the maximum value for a short integer.]
-        chunk = numpy.vectorize(lambda sample: struct.pack('h', int(sample * 32767.0)))(chunk)
-        wav_file.writeframes(chunk)
-
-        wav_file.close()
-        return
+            for offset, audio in self.audio[channel]:
+                bus.add(audio, offset)
+            bus.reserve(self.ends[channel])
+        return bus.mix()
+
+    def blocks(self, block_size=BLOCK_SIZE):
+        chunk = self.mix()
+        for start in range(0, len(chunk), block_size):
+            yield chunk[start:start + block_size]
+
+    # Length of the mix in samples, without mixing
+    def num_frames(self):
+        return max(self.ends.values(), default=0)
+
+    # The length is known up front, so the header is written once and the file needn't be seekable
+    def save(self, file_name, sample_format='pcm16', dither=False):
+        with WavWriter(file_name, self.sample_rate, 1, sample_format, self.num_frames(), dither) as writer:
+            for block in self.blocks():
+                writer.write(block)
+
+    # Starts callback driven playback and returns its controller without blocking
+    def start(self, loop=False):
+        return Wav.start_playback(Playback(self.blocks, self.sample_rate, loop), self.backend)
 
     def play(self, loop=False):
-        with ignore_stderr():
-            p = pyaudio.PyAudio()
-        stream = p.open(
-            format=pyaudio.paFloat32,
-            channels=1,
-            rate=self.sample_rate,
-            output=True
-        )
-
-        chunk_dict = {}
-        maxlen = 0
-        for channel in self.audio:
-            chunk_dict[channel] = numpy.concatenate(self.audio[channel]) * 0.25
-            if len(chunk_dict[channel]) > maxlen:
-                maxlen = len(chunk_dict[channel])
-        vals = list(chunk_dict.values())
-        chunk = vals[0]
-        difflen = maxlen - len(chunk)
-        if difflen > 0:
-            chunk = numpy.pad(chunk, (0, difflen), 'constant')
-        for val in vals[1:]:
-            difflen = maxlen - len(val)
-            if difflen > 0:
-                val = numpy.pad(val, (0, difflen), 'constant')
-            chunk += val
-        chunk = chunk.astype(numpy.float32).tostring()
-
-        if loop:
-            while(1):
-                stream.write(chunk)
-
-        stream.write(chunk)
-
-        stream.stop_stream()
-        stream.close()
-
-        p.terminate()
+        Wav.wait_playback(self.start(loop))
+
+    @staticmethod
+    def start_playback(playback, backend='pyaudio'):
+        if isinstance(backend, str):
+            backend = create_backend(backend)
+
+        playback.start()
+        try:
+            playback.open_output(backend, BLOCK_SIZE)
+        except Exception:
+            # Nothing will pull from the producer, so don't leave it running
+            playback.stop()
+            raise
+        return playback
+
+    @staticmethod
+    def wait_playback(playback):
+        try:
+            playback.wait()
+        finally:
+            playback.stop()
+
+    # Blocks of float samples, see WavReader for the formats read
+    @staticmethod
+    def read_file(file, block_size=BLOCK_SIZE):
+        with WavReader(file) as reader:
+            yield from reader.blocks(block_size)
 
     @classmethod
-    def play_file(cls, file):
-        chunk_size = 1024
-
-        wf = wave.open(file, 'rb')
-
-        with ignore_stderr():
-            p = pyaudio.PyAudio()
-
-        stream = p.open(
-            format=p.get_format_from_width(wf.getsampwidth()),
-            channels=wf.getnchannels(),
-            rate=wf.getframerate(),
-            output=True
-        )
-
-        data = wf.readframes(chunk_size)
-        while data != b'':
-            stream.write(data)
-            data = wf.readframes(chunk_size)
-
-        stream.stop_stream()
-        stream.close()
+    def play_file(cls, file, backend='pyaudio'):
+        with WavReader(file) as reader:
+            channels = reader.nchannels
+            sample_rate = reader.sample_rate
 
-        p.terminate()
+        playback = Playback(lambda: Wav.read_file(file), sample_rate, channels=channels)
+        Wav.wait_playback(Wav.start_playback(playback, backend))
 
 
 if __name__ == '__main__':
@@ -142,6 +121,12 @@ if __name__ == '__main__':
                         help='Generate a wav file and play it.')
     parser.add_argument('-o', '--output',
                         help='Generate a wav file and save it to this ouput.')
+    parser.add_argument('-f', '--format', default='pcm16', choices=list(WavWriter.sample_formats),
+                        help='The sample format of the saved wav file.')
+    parser.add_argument('-d', '--dither', action='store_true',
+                        help='Dither the saved wav file when reducing to integer samples.')
+    parser.add_argument('-b', '--backend', default='pyaudio', choices=[name for name in BACKENDS if name != 'file'],
+                        help='The audio output used for playing.')
 
     args = parser.parse_args()
     if not (args.output or args.generate or args.play):
@@ -149,7 +134,7 @@ if __name__ == '__main__':
         sys.exit()
 
     if args.output or args.generate:
-        wav = Wav(88200)
+        wav = Wav(88200, backend=args.backend)
         sound1 = wav.synth.chime
         sound2 = wav.synth.chime_soft
         wav.append_sound(wav.synth.chord([440.00], sound2)+wav.synth.chord([440.00], sound1))
@@ -160,10 +145,10 @@ if __name__ == '__main__':
 
         if args.output:
             print('Saving to', args.output, flush=True)
-            wav.save(args.output)
+            wav.save(args.output, args.format, args.dither)
         if args.generate:
             wav.play()
 
     if args.play:
         print('Playing', args.play, flush=True)
-        Wav.play_file(args.play)
+        Wav.play_file(args.play, args.backend)
@@ -0,0 +1,91 @@
+import struct
+import numpy
+
+from .wav_writer import WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT
+
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+class WavReader:
+    # Reads PCM and IEEE float wav files, which the wave module can't, as float samples in [-1, 1]
+    def __init__(self, file):
+        if isinstance(file, str):
+            self.file = open(file, 'rb')
+            self.owns_file = True
+        else:
+            self.file = file
+            self.owns_file = False
+
+        try:
+            self.read_header()
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def read_header(self):
+        riff, _, wave = struct.unpack('<4sI4s', self.file.read(12))
+        if riff != b'RIFF' or wave != b'WAVE':
+            raise ValueError('Not a RIFF WAVE file')
+
+        fmt = None
+        while True:
+            header = self.file.read(8)
+            if len(header) < 8:
+                raise ValueError('No data chunk in wav file')
+            chunk_id, size = struct.unpack('<4sI', header)
+            if chunk_id == b'data':
+                break
+            data = self.file.read(size + size % 2)
+            if chunk_id == b'fmt ':
+                fmt = data[:size]
+
+        if fmt is None:
+            raise ValueError('No fmt chunk before the data chunk in wav file')
+        self.format_tag, self.nchannels, self.sample_rate, _, _, bits = struct.unpack('<HHIIHH', fmt[:16])
+        if self.format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+            # The actual format is the start of the sub format GUID
+            self.format_tag = struct.unpack('<H', fmt[24:26])[0]
+        self.sampwidth = bits // 8
+
+        if (self.format_tag, self.sampwidth) not in [(WAVE_FORMAT_PCM, 1), (WAVE_FORMAT_PCM, 2), (WAVE_FORMAT_PCM, 3),
+                                                     (WAVE_FORMAT_PCM, 4), (WAVE_FORMAT_IEEE_FLOAT, 4),
+                                                     (WAVE_FORMAT_IEEE_FLOAT, 8)]:
+            raise ValueError(f"Unsupported wav format {self.format_tag} with {bits} bit samples")
+        self.nframes = size // (self.nchannels * self.sampwidth)
+        self.frames_read = 0
+
+    # Interleaved samples, block_size frames at a time
+    def blocks(self, block_size=4096):
+        while self.frames_read < self.nframes:
+            count = min(block_size, self.nframes - self.frames_read)
+            data = self.file.read(count * self.nchannels * self.sampwidth)
+            count = len(data) // (self.nchannels * self.sampwidth)
+            if count == 0:
+                return
+            self.frames_read += count
+            yield self.convert(data[:count * self.nchannels * self.sampwidth])
+
+    def convert(self, data):
+        if self.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+            return numpy.frombuffer(data, f"<f{self.sampwidth}").astype(numpy.float32)
+
+        if self.sampwidth == 1:
+            samples = numpy.frombuffer(data, numpy.uint8).astype(numpy.float32) - 128.0
+        elif self.sampwidth == 3:
+            samples = numpy.frombuffer(data, numpy.uint8).reshape(-1, 3)
+            samples = (samples[:, 0].astype(numpy.int32) | samples[:, 1].astype(numpy.int32) << 8
+                       | samples[:, 2].astype(numpy.int8).astype(numpy.int32) << 16).astype(numpy.float32)
+        else:
+            samples = numpy.frombuffer(data, f"<i{self.sampwidth}").astype(numpy.float32)
+        return samples / float(2 ** (self.sampwidth * 8 - 1))
+
+    def close(self):
+        if self.owns_file and self.file is not None:
+            self.file.close()
+        self.file = None
@@ -0,0 +1,111 @@
+import struct
+import numpy
+
+WAVE_FORMAT_PCM = 1
+WAVE_FORMAT_IEEE_FLOAT = 3
+
+
+class WavWriter:
+    # sample_format: (bytes per sample, wave format tag)
+    sample_formats = {
+        'pcm16': (2, WAVE_FORMAT_PCM),
+        'pcm24': (3, WAVE_FORMAT_PCM),
+        'float32': (4, WAVE_FORMAT_IEEE_FLOAT),
+    }
+
+    def __init__(self, file, sample_rate, nchannels=1, sample_format='pcm16', nframes=None, dither=False,
+                 block_size=65536):
+        if sample_format not in self.sample_formats:
+            raise ValueError(f"Unsupported sample format: {sample_format}, try one of {list(self.sample_formats)}")
+
+        if isinstance(file, str):
+            self.file = open(file, 'wb')
+            self.owns_file = True
+        else:
+            self.file = file
+            self.owns_file = False
+
+        self.sample_rate = sample_rate
+        self.nchannels = nchannels
+        self.sample_format = sample_format
+        self.sampwidth, self.format_tag = self.sample_formats[sample_format]
+        self.dither = dither and self.format_tag == WAVE_FORMAT_PCM
+        self.block_size = block_size
+        self.rng = numpy.random.default_rng()
+
+        # When the length isn't known up front the header is patched on close, which needs a seekable file
+        self.nframes = nframes
+        self.frames_written = 0
+        self.header_start = self.file.tell() if nframes is None else None
+        self.write_header(nframes or 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def write_header(self, nframes):
+        data_size = nframes * self.nchannels * self.sampwidth
+        block_align = self.nchannels * self.sampwidth
+        fmt = struct.pack('<HHIIHH', self.format_tag, self.nchannels, self.sample_rate,
+                          self.sample_rate * block_align, block_align, self.sampwidth * 8)
+
+        if self.format_tag == WAVE_FORMAT_PCM:
+            chunks = b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+        else:
+            # Non-PCM formats carry an extension size and a fact chunk with the frame count
+            fmt += struct.pack('<H', 0)
+            chunks = b'fmt ' + struct.pack('<I', len(fmt)) + fmt + b'fact' + struct.pack('<II', 4, nframes)
+
+        self.file.write(b'RIFF' + struct.pack('<I', 4 + len(chunks) + 8 + data_size + data_size % 2) + b'WAVE')
+        self.file.write(chunks + b'data' + struct.pack('<I', data_size))
+
+    # Frames are floats in [-1, 1], shaped (frames,) for mono or (frames, channels) interleaved
+    def write(self, frames):
+        frames = numpy.asarray(frames)
+        if frames.ndim == 1:
+            frames = frames.reshape(-1, 1)
+        if frames.shape[1] != self.nchannels:
+            raise ValueError(f"Expected {self.nchannels} channels, got {frames.shape[1]}")
+
+        for start in range(0, len(frames), self.block_size):
+            block = frames[start:start + self.block_size]
+            self.file.write(self.convert(block.reshape(-1)))
+            self.frames_written += len(block)
+
+    def convert(self, samples):
+        if self.format_tag == WAVE_FORMAT_IEEE_FLOAT:
+            return samples.astype('<f4', copy=False).tobytes()
+
+        max_value = 2 ** (self.sampwidth * 8 - 1)
+        scaled = samples.astype(numpy.float64) * (max_value - 1)
+        if self.dither:
+            # Triangular (TPDF) dither of +/- 1 LSB
+            scaled += self.rng.random(len(scaled)) - self.rng.random(len(scaled))
+        ints = numpy.clip(numpy.rint(scaled), -max_value, max_value - 1)
+
+        if self.sampwidth == 2:
+            return ints.astype('<i2').tobytes()
+        return ints.astype('<i4').view(numpy.uint8).reshape(-1, 4)[:, :self.sampwidth].tobytes()
+
+    def close(self):
+        if self.file is None:
+            return
+
+        data_size = self.frames_written * self.nchannels * self.sampwidth
+        if data_size % 2:
+            self.file.write(b'\x00')
+
+        if self.nframes is None:
+            end = self.file.tell()
+            self.file.seek(self.header_start)
+            self.write_header(self.frames_written)
+            self.file.seek(end)
+
+        if self.owns_file:
+            self.file.close()
+        self.file = None
+
+        if self.nframes is not None and self.nframes != self.frames_written:
+            raise ValueError(f"Header promised {self.nframes} frames but {self.frames_written} were written")
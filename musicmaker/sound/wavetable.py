@@ -0,0 +1,73 @@
+import functools
+import math
+import numpy
+
+from .synth import Synth, vectorized, sample_indices
+
+
+class Wavetable:
+    # Partials are (harmonic, amplitude) pairs making up one cycle of the waveform
+    def __init__(self, partials, size=4096):
+        self.size = size
+        self.partials = sorted(partials)
+        self.harmonics = numpy.array([harmonic for harmonic, _ in self.partials], dtype=float)
+
+        # tables[i] holds only the lowest i partials, so high notes can drop those above nyquist
+        phases = numpy.arange(size + 1) * (math.pi * 2.0 / size)
+        self.tables = [numpy.zeros(size + 1)]
+        for harmonic, amplitude in self.partials:
+            self.tables.append(self.tables[-1] + numpy.sin(phases * harmonic) * amplitude)
+        for table in self.tables:
+            table.flags.writeable = False
+
+    @functools.lru_cache(8)
+    def tables_as(self, dtype):
+        tables = [table.astype(dtype) for table in self.tables]
+        for table in tables:
+            table.flags.writeable = False
+        return tables
+
+    def band_limit(self, freq, sample_rate):
+        return numpy.searchsorted(self.harmonics, (sample_rate / 2.0) / freq, side='left')
+
+    def lookup(self, table, phase):
+        index = phase.astype(numpy.intp)
+        lower = table[index]
+        return lower + (phase - index).astype(table.dtype) * (table[index + 1] - lower)
+
+    def render(self, freq, num_samples, sample_rate, dtype=numpy.float64):
+        freq = numpy.asarray(freq, dtype=numpy.float64)
+        phase = (sample_indices(num_samples) * (freq * (self.size / sample_rate))) % self.size
+        levels = self.band_limit(freq, sample_rate)
+        tables = self.tables_as(numpy.dtype(dtype))
+
+        if levels.ndim == 0 or numpy.all(levels == levels.flat[0]):
+            return self.lookup(tables[int(levels.flat[0])], phase)
+
+        # A column of frequencies spanning several band limits, see Synth.batch_chord
+        data = numpy.empty(phase.shape, dtype=dtype)
+        levels = levels.reshape(-1)
+        for level in numpy.unique(levels):
+            rows = levels == level
+            data[rows] = self.lookup(tables[level], phase[rows])
+        return data
+
+
+SINE_TABLE = Wavetable([(1, 0.2)])
+HARMONICS_TABLE = Wavetable([(1, 0.2), (2, 0.2*0.5), (4, 0.2*0.125)])
+HARMONICS_SOFT_TABLE = Wavetable([(1, 0.2), (2, 0.2*0.5)])
+
+
+# Renders the built-in timbres by table lookup instead of evaluating every partial
+class WavetableSynth(Synth):
+    @vectorized
+    def sine_tone(self, freq=440.0, duration_ms=1000, volume=1.0):
+        return SINE_TABLE.render(freq, self.num_samples(duration_ms), self.sample_rate, self.dtype)
+
+    @vectorized
+    def harmonics(self, freq, duration_ms=1000, volume=1.0):
+        return HARMONICS_TABLE.render(freq, self.num_samples(duration_ms), self.sample_rate, self.dtype)
+
+    @vectorized
+    def harmonics_soft(self, freq, duration_ms=1000, volume=1.0):
+        return HARMONICS_SOFT_TABLE.render(freq, self.num_samples(duration_ms), self.sample_rate, self.dtype)
@@ -0,0 +1,40 @@
+import random
+
+
+class AliasTable:
+    # Walker's alias method with Vose's construction: O(n) to build, then O(1) per sample
+    def __init__(self, weights):
+        total = float(sum(weights))
+        if len(weights) == 0 or total <= 0:
+            raise ValueError(f"Alias tables need a positive total weight, got {list(weights)}")
+
+        n = len(weights)
+        self.probabilities = [weight / total for weight in weights]
+        self.accept = [0.0] * n
+        self.alias = list(range(n))
+
+        scaled = [p * n for p in self.probabilities]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less = small.pop()
+            more = large.pop()
+            self.accept[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            if scaled[more] < 1.0:
+                small.append(more)
+            else:
+                large.append(more)
+
+        # Whatever is left is 1 up to rounding
+        for i in small + large:
+            self.accept[i] = 1.0
+
+    def __len__(self):
+        return len(self.accept)
+
+    def sample(self, rng=random):
+        u = rng.random() * len(self.accept)
+        i = int(u)
+        return i if u - i < self.accept[i] else self.alias[i]
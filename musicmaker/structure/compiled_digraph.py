@@ -0,0 +1,105 @@
+import numpy
+
+
+class CompiledDigraph:
+    # A frozen copy of a WeightedDigraph in CSR form: the edges of node i are indices[indptr[i]:indptr[i+1]]
+    # with weights in the same place. Node ids follow the sorted node values when they sort, so they
+    # don't depend on the order the graph was built in
+    def __init__(self, digraph):
+        try:
+            self.values = sorted(digraph.V)
+        except TypeError:
+            self.values = list(digraph.V)
+        self.ids = {value: i for i, value in enumerate(self.values)}
+
+        indptr = [0]
+        indices = []
+        weights = []
+        for value in self.values:
+            node = digraph.V[value]
+            for neighbor in node.neighbors():
+                indices.append(self.ids[neighbor.value])
+                weights.append(node.adj[neighbor])
+            indptr.append(len(indices))
+
+        self.indptr = numpy.array(indptr, dtype=numpy.int64)
+        self.indices = numpy.array(indices, dtype=numpy.int64)
+        self.weights = numpy.array(weights, dtype=numpy.float64)
+        for array in [self.indptr, self.indices, self.weights]:
+            array.flags.writeable = False
+
+    def __len__(self):
+        return len(self.values)
+
+    def outdegree(self):
+        return numpy.diff(self.indptr)
+
+    def neighbors(self, i):
+        return self.indices[self.indptr[i]:self.indptr[i+1]]
+
+    def edge_weights(self, i):
+        return self.weights[self.indptr[i]:self.indptr[i+1]]
+
+    # Rows of each edge, lining up with indices and weights
+    def sources(self):
+        return numpy.repeat(numpy.arange(len(self.values)), self.outdegree())
+
+    # Dense (nodes x nodes) weights, with missing where there is no edge
+    def weight_matrix(self, missing=numpy.inf):
+        matrix = numpy.full((len(self.values), len(self.values)), missing, dtype=numpy.float64)
+        matrix[self.sources(), self.indices] = self.weights
+        return matrix
+
+    # Row-stochastic transition matrix, uniform over the neighbors like ProgressionGenerator.generate
+    # unless probability maps edge weights to relative chances. Nodes without edges get a zero row
+    def transition_matrix(self, probability=None):
+        if probability is None:
+            chances = numpy.ones(len(self.weights))
+        else:
+            chances = numpy.array([probability(weight) for weight in self.weights], dtype=numpy.float64)
+
+        matrix = numpy.zeros((len(self.values), len(self.values)))
+        matrix[self.sources(), self.indices] = chances
+        totals = matrix.sum(axis=1, keepdims=True)
+        numpy.divide(matrix, totals, out=matrix, where=totals > 0)
+        return matrix
+
+    # Chance of being at each node after steps transitions from start
+    def distribution(self, start, steps=1, probability=None):
+        state = numpy.zeros(len(self.values))
+        state[self.ids[start]] = 1.0
+        matrix = self.transition_matrix(probability)
+        for _ in range(steps):
+            state = state @ matrix
+        return state
+
+    # Fewest transitions from start to every node, -1 for the unreachable ones
+    def hops(self, start):
+        hops = numpy.full(len(self.values), -1, dtype=numpy.int64)
+        frontier = numpy.array([self.ids[start]])
+        hops[frontier] = 0
+        distance = 0
+        while len(frontier) > 0:
+            distance += 1
+            reached = numpy.concatenate([self.neighbors(i) for i in frontier])
+            frontier = numpy.unique(reached[hops[reached] < 0])
+            hops[frontier] = distance
+        return hops
+
+    # A random walk of length node values from start, drawn from the transition matrix.
+    # Like WeightedDigraph, raises ValueError on reaching a node without edges
+    def walk(self, start, length, probability=None, rng=None):
+        rng = numpy.random.default_rng() if rng is None else rng
+        matrix = self.transition_matrix(probability)
+        cumulative = numpy.cumsum(matrix, axis=1)
+        # Last column with a chance in each row, so rounding in the cumsum can't step onto a missing edge
+        last = len(self.values) - 1 - numpy.argmax(matrix[:, ::-1] > 0, axis=1)
+        cur = self.ids[start]
+        path = [cur]
+        for u in rng.random(length - 1):
+            total = cumulative[cur, -1]
+            if total <= 0:
+                raise ValueError(f"Node {self.values[cur]} has no edges to walk")
+            cur = min(int(numpy.searchsorted(cumulative[cur], u * total, side='right')), int(last[cur]))
+            path.append(cur)
+        return [self.values[i] for i in path]
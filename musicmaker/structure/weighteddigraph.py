@@ -1,17 +1,43 @@
+import random
+
+from .alias_table import AliasTable
+
+
 class WeightedDigraph:
     class Node:
         def __init__(self, value):
             self.value = value
             self.adj = {}
+            self.cached_sampler = None  # (probability, neighbors, alias table)
+            self.sorted_neighbors = None
 
         def add_neighbor(self, node, weight=0):
             self.adj[node] = weight
+            self.cached_sampler = None
+            self.sorted_neighbors = None
+
+        # Neighbors and an alias table over them. Only the table of the latest weight-to-probability mapping
+        # is kept, so callers passing a new function each time don't pile up tables
+        def sampler(self, probability):
+            if self.cached_sampler is None or self.cached_sampler[0] is not probability:
+                neighbors = self.neighbors()
+                self.cached_sampler = (probability, neighbors,
+                                       AliasTable([probability(self.adj[n]) for n in neighbors]))
+            return self.cached_sampler[1:]
+
+        # Picks a neighbor with a chance of probability(weight), relative to the other neighbors
+        def sample(self, probability, rng=random):
+            neighbors, table = self.sampler(probability)
+            return neighbors[table.sample(rng)]
 
         def outdegree(self):
             return len(self.adj)
 
+        # Sorted once until the next neighbor is added, so callers must not modify the list
         def neighbors(self):
-            return sorted(self.adj.keys(), key=lambda n: n.value)
+            if self.sorted_neighbors is None:
+                self.sorted_neighbors = sorted(self.adj.keys(), key=lambda n: n.value)
+            return self.sorted_neighbors
 
         def value(self):
             return self.value
@@ -55,6 +81,12 @@ class WeightedDigraph:
     def vertixes(self):
         return self.V.keys()
 
+    # A frozen, integer-indexed copy for numpy, see CompiledDigraph
+    def compile(self):
+        from .compiled_digraph import CompiledDigraph
+
+        return CompiledDigraph(self)
+
     def show(self):
         for key in sorted(self.V):
             v = self.V[key]
@@ -0,0 +1,62 @@
+import unittest
+import tempfile
+import numpy
+import time
+import os
+
+from musicmaker.sound.backend import Backend, FileBackend, NullBackend, create_backend
+from musicmaker.sound.playback import Playback
+from musicmaker.sound.wav import Wav
+
+
+class BackendTestCase(unittest.TestCase):
+    def setUp(self):
+        self.wav = Wav(8000)
+        self.wav.append_sound(self.wav.synth.chord([440.0, 660.0], self.wav.synth.chime, 500))
+        self.wav.add_rest(250)
+        self.wav.append_sound(self.wav.synth.chime(880.0, 250), 'other')
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'out.wav')
+            self.wav.backend = FileBackend(file_name)
+            self.wav.play()
+
+            blocks = list(Wav.read_file(file_name))
+        numpy.testing.assert_allclose(numpy.concatenate(blocks), self.wav.mix(), atol=1.0/32767)
+
+    def test_float_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_name = os.path.join(directory, 'out.wav')
+            self.wav.save(file_name, 'float32')
+            numpy.testing.assert_array_equal(numpy.concatenate(list(Wav.read_file(file_name, 1000))), self.wav.mix())
+            Wav.play_file(file_name, FileBackend(os.path.join(directory, 'copy.wav')))
+            numpy.testing.assert_allclose(numpy.concatenate(list(Wav.read_file(os.path.join(directory, 'copy.wav')))),
+                                          self.wav.mix(), atol=1.0/32767)
+
+    def test_null_backend(self):
+        self.wav.backend = 'null'
+        start = time.monotonic()
+        self.wav.play()
+        self.assertGreaterEqual(time.monotonic() - start, 0.7)
+
+        self.assertIsInstance(create_backend('null'), NullBackend)
+        with self.assertRaises(ValueError):
+            create_backend('speakers')
+        with self.assertRaises(TypeError):
+            Backend()
+
+    def test_failed_open(self):
+        class Unavailable(NullBackend):
+            def open(self, *args):
+                raise ImportError('No audio device')
+
+        # A buffer smaller than the audio keeps the producer waiting for an output to pull
+        playback = Playback(self.wav.blocks, self.wav.sample_rate, buffer_frames=1024, prebuffer_frames=512)
+        with self.assertRaises(ImportError):
+            Wav.start_playback(playback, Unavailable())
+        self.assertFalse(playback.producer.is_alive())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,6 @@
 import unittest
 
-from musicmaker.theory.chord import Chord
+from musicmaker.theory.chord import Chord, chord_template
 from musicmaker.theory.pitch import Pitch
 from musicmaker.theory.scale import Scale
 
@@ -109,6 +109,32 @@ class ChordTestCase(unittest.TestCase):
                         self.assertEqual(c.get_notes(), [p.raise_octave(overall_octave_diff)
                                          for p in sorted(expected_pitches, key=lambda v: v.value)])
 
+    def test_chord_compile(self):
+        # Every kind and extension, every adjustment and slash bass on a few of them, and some mixing them all
+        kinds = ["", "maj", "mM", "m", "dim", "aug"]
+        suffixes = [f"{kind}{add}" for kind in kinds for add in ["", "7", "9", "13"]]
+        suffixes += [f"{kind}7{adjust}" for kind in ["", "m"]
+                     for adjust in ["sus4", "b5", "#5", "no3", "b9#9", "no5add#11", "#1", "no1"]]
+        suffixes += [f"{chord}{bass}" for chord in ["", "maj7", "m9", "dim"] for bass in ["/E", "/Cb", "/b7", "/##5"]]
+        suffixes += ["m13no5add#11/##5", "aug9b9#9/Cb", "mM7#1/b7", "dim13no3/E", "no1/E", "sus4/b7"]
+        # Naturals, single and double accidentals, and roots spelled across the octave boundary
+        for note in ["C", "G", "C#", "Bb", "B#", "Cb", "B##", "Cbb", "Dbb", "E#", "Fb", "A##"]:
+            for suffix in suffixes:
+                for octave in [-1, 4]:
+                    c = Chord(f"{note}{suffix}", octave)
+                    compiled = Chord.compile(f"{note}{suffix}", octave)
+                    self.assertEqual([str(p) for p in compiled.get_notes()], [str(p) for p in c.get_notes()])
+                    self.assertEqual(compiled.bass, c.bass)
+
+        self.assertIs(chord_template(Chord.split("Cmaj7/E")[1]), chord_template(Chord.split("Dbmaj7/F")[1]))
+        template = chord_template(Chord.split("Cm7")[1])
+        roots = [Pitch.create(note).value for note in Pitch.notes()]
+        for root, values in zip(roots, template.transpose_many(roots)):
+            self.assertEqual(list(values), template.transpose(root))
+
+        with self.assertRaises(ValueError):
+            Chord.compile("Cmaj7/H")
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,45 @@
+import unittest
+
+from musicmaker.theory.chord_recognizer import ChordRecognizer, CHORD_SUFFIXES
+from musicmaker.theory.chord import Chord
+from musicmaker.theory.pitch import Pitch, pitch_class_mask
+from musicmaker.theory.staff import Staff
+
+
+class ChordRecognizerTestCase(unittest.TestCase):
+    def test_recognize(self):
+        recognizer = ChordRecognizer.default()
+        for note in Pitch.notes():
+            for suffix in CHORD_SUFFIXES:
+                notes = Chord.compile(note + suffix).notes
+                matches = recognizer.recognize(notes)
+                self.assertIn(Pitch.create(note).normal().name + suffix, [match.name for match in matches])
+                for match in matches:
+                    self.assertEqual(pitch_class_mask(Chord.compile(match.name).notes), pitch_class_mask(notes))
+
+        self.assertEqual(recognizer.best(Chord('Am7').notes).name, 'Am7')
+        self.assertEqual([match.name for match in recognizer.recognize(Chord('Am7').notes)], ['Am7', 'C6/A'])
+        self.assertEqual(recognizer.recognize([Pitch('C', 4), Pitch('Db', 4), Pitch('D', 4)]), [])
+        self.assertEqual(recognizer.recognize([]), [])
+
+    def test_inversions(self):
+        recognizer = ChordRecognizer.default()
+        match = recognizer.best([Pitch('G', 3), Pitch('C', 4), Pitch('E', 4)])
+        self.assertEqual((match.name, match.root, match.bass, match.inversion), ('C/G', 'C', 'G', 2))
+        self.assertEqual(recognizer.best(Chord('Cmaj7/B').notes).inversion, 3)
+        self.assertEqual([match.name for match in recognizer.recognize(Chord('Ebm7/Gb').notes)], ['Gb6', 'Ebm7/Gb'])
+
+        staff = Staff()
+        staff.add([Pitch('E', 3)], 2, line=1)
+        staff.add([Pitch('F', 3)], 2, line=1)
+        staff.add([Pitch('C', 4), Pitch('G', 4)], 1, line=2)
+        staff.add([Pitch('A', 4), Pitch('C', 5)], 2, line=2)
+        self.assertEqual(recognizer.recognize_staff(staff, 0, 1)[0].name, 'C/E')
+        self.assertEqual(recognizer.recognize_staff(staff, 2, 3)[0].name, 'F')
+        self.assertEqual(recognizer.recognize_staff(staff, 1, 2)[0].name, 'Am/E')
+        self.assertEqual(recognizer.recognize_staff(staff, 0, 4)[0].name, 'Fmaj7add9/E')
+        self.assertEqual(recognizer.recognize_staff(staff, 0, 4)[0].inversion, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
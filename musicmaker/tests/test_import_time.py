@@ -0,0 +1,39 @@
+import subprocess
+import unittest
+import sys
+
+# Generous budget for everything the chord CLI imports, audio libraries alone blow far past it
+IMPORT_BUDGET_US = 250000
+HEAVY_MODULES = ['numpy', 'scipy', 'pyaudio', 'methodtools']
+
+
+class ImportTimeTestCase(unittest.TestCase):
+    def import_times(self, *args):
+        result = subprocess.run([sys.executable, '-X', 'importtime', *args], capture_output=True, text=True, check=True)
+
+        times = {}
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            self_us, _, name = line[len('import time:'):].split('|')
+            times[name.strip()] = int(self_us)
+        return result.stdout, times
+
+    def test_chord_cli(self):
+        output, times = self.import_times('-m', 'musicmaker.theory.chord', 'Cmaj7')
+        self.assertIn('Cmaj7', output)
+
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, times)
+        self.assertLess(sum(times.values()), IMPORT_BUDGET_US)
+
+    def test_theory_modules(self):
+        for module in ['musicmaker.theory.scale', 'musicmaker.theory.major_progression_generator',
+                       'musicmaker.theory.minor_progression_generator', 'musicmaker.parser.abc_parser']:
+            _, times = self.import_times('-c', f"import {module}")
+            for heavy_module in HEAVY_MODULES:
+                self.assertNotIn(heavy_module, times, module)
+
+
+if __name__ == '__main__':
+    unittest.main()
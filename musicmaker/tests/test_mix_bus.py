@@ -0,0 +1,33 @@
+import unittest
+import numpy
+
+from musicmaker.sound.mix_bus import MixBus
+
+
+class MixBusTestCase(unittest.TestCase):
+    def test_mix_bus(self):
+        bus = MixBus(numpy.float32, gain=0.5)
+        bus.add(numpy.ones(3))
+        bus.add(numpy.zeros(2), 3)
+        bus.add(numpy.full(2, 2.0), 5)
+        bus.add(numpy.full(4, 4.0))
+        bus.add(numpy.full(6, 1.0), 4)
+        bus.add(numpy.ones(2), 20)
+        bus.add(numpy.ones(0), 30)
+
+        self.assertEqual(len(bus), 22)
+        mixed = bus.mix()
+        self.assertEqual(mixed.dtype, numpy.float32)
+        numpy.testing.assert_array_equal(mixed, [2.5, 2.5, 2.5, 2.0, 0.5, 1.5, 1.5, 0.5, 0.5, 0.5] + [0.0]*10 + [0.5, 0.5])
+
+        for block_size in [1, 3, 5, 22]:
+            blocks = [bus.mix_range(start, min(start + block_size, len(bus))) for start in range(0, len(bus), block_size)]
+            numpy.testing.assert_array_equal(numpy.concatenate(blocks), mixed)
+
+        bus.discard_before(10)
+        self.assertEqual(len(bus.fragments), 1)
+        numpy.testing.assert_array_equal(bus.mix_range(10, 22), mixed[10:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+import numpy
+
+from musicmaker.sound.note_cache import NoteCache
+
+
+class NoteCacheTestCase(unittest.TestCase):
+    def test_note_cache(self):
+        cache = NoteCache(max_bytes=3*800)
+        renders = []
+
+        def render(n):
+            renders.append(n)
+            return numpy.full(100, float(n))
+
+        for n in [1, 2, 1, 3, 1, 2]:
+            data = cache.get_else_render(('sound', n), lambda: render(n))
+            self.assertEqual(data[0], n)
+            self.assertFalse(data.flags.writeable)
+        self.assertEqual(renders, [1, 2, 3])
+        self.assertEqual((cache.hits, cache.misses), (3, 3))
+        self.assertEqual(cache.hit_rate(), 0.5)
+
+        # Least recently used buffer is evicted once over budget
+        cache.get_else_render(('sound', 4), lambda: render(4))
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.nbytes, 3*800)
+        self.assertNotIn(('sound', 3), cache)
+        self.assertIn(('sound', 1), cache)
+
+        # Buffers larger than the budget are returned but never cached
+        cache.get_else_render(('sound', 5), lambda: numpy.zeros(1000))
+        self.assertNotIn(('sound', 5), cache)
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.nbytes, cache.hits, cache.misses), (0, 0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
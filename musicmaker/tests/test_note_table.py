@@ -0,0 +1,73 @@
+import unittest
+import numpy
+
+from musicmaker.theory.note_table import NoteTable
+from musicmaker.theory.staff import Staff
+from musicmaker.theory.pitch import Pitch
+
+
+class NoteTableTestCase(unittest.TestCase):
+    def setUp(self):
+        self.staff = Staff(tempo=90)
+        for n in range(8):
+            self.staff.add([Pitch(midi=60 + n), Pitch(midi=64 + n)], 0.5, line=1)
+        self.staff.add([Pitch(midi=48)], 1, line=2)
+        self.staff.add([], 1, line=2)
+        self.staff.add([Pitch(midi=43)], 2, line=2)
+
+    def groups(self, staff):
+        return {key: [([note.value for note in notes], length) for notes, length in staff.lines[key].note_groups]
+                for key in staff.lines}
+
+    def test_round_trip(self):
+        table = NoteTable.from_staff(self.staff)
+        self.assertEqual(len(table), 18)
+        self.assertEqual(table.total_beats, 4)
+        self.assertEqual(list(table.notes['line'][table.notes['midi'] == 43]), [1])
+        staff = table.to_staff()
+        self.assertEqual(staff.tempo, 90)
+        self.assertEqual(self.groups(staff), self.groups(self.staff))
+
+        self.staff.add_multi_length([(Pitch(midi=50), 1), (Pitch(midi=53), 3)], line=1)
+        staff = NoteTable.from_staff(self.staff).to_staff()
+        self.assertEqual(self.groups(staff)[1][-1], ([50], 1))
+        self.assertEqual(self.groups(staff)['multi_length1.0'], [([], 4), ([53], 3)])
+
+    def test_bulk_operations(self):
+        table = NoteTable.from_staff(self.staff)
+        up = table.transpose(12)
+        numpy.testing.assert_array_equal(up.notes['midi'], table.notes['midi'] + 12)
+        self.assertEqual(self.groups(table.to_staff())[1][0][0], [60, 64])
+
+        slow = table.stretch(2)
+        self.assertEqual(slow.total_beats, 8)
+        self.assertEqual(self.groups(slow.to_staff())[2], [([48], 2), ([], 2), ([43], 4)])
+
+        part = table.slice(1, 3)
+        self.assertEqual(len(part), 9)
+        self.assertEqual(self.groups(part.to_staff())[2], [([], 1), ([43], 2)])
+
+        table.notes['onset'][0] = 0.25
+        with self.assertRaises(ValueError):
+            table.to_staff()
+
+    def test_triplets(self):
+        staff = Staff()
+        for n in range(12):
+            staff.add([Pitch(midi=60 + n)], 1 / 3, line=1)
+        staff.add_multi_length([(Pitch(midi=48), 1 / 3), (Pitch(midi=55), 2 / 3)], line=1)
+        table = NoteTable.from_staff(staff)
+
+        for factor in [1.1, 1.5, 3]:
+            stretched = table.stretch(factor).to_staff()
+            self.assertEqual(len(stretched.lines[1].note_groups), 13)
+            self.assertAlmostEqual(stretched.lines[1].total_beats, 13 / 3 * factor)
+        for start in [1 / 3, 1, 1.5]:
+            part = table.slice(start).to_staff()
+            self.assertEqual(sum(len(notes) for notes, _ in part.lines[1].note_groups),
+                             len(table.slice(start).notes) - 1)
+        self.assertEqual(len(table.stretch(1.1).slice(1.1, 2.2)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
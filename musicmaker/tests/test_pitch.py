@@ -1,5 +1,6 @@
 import unittest
 import math
+import pickle
 
 from musicmaker.theory.pitch import Pitch
 
@@ -48,6 +49,29 @@ class PitchTestCase(unittest.TestCase):
 
                 self.assertTrue(Pitch.valid(p.name))
 
+    def test_value_type(self):
+        p = Pitch.create('A', 4)
+        self.assertIs(p, Pitch.create(midi=69))
+        self.assertIs(p, Pitch.create('A', 3).raise_octave())
+        self.assertIsNot(p, Pitch.create(midi=69, tuning=432))
+        self.assertEqual(Pitch.create('G#', 4), Pitch.create('Ab', 4))
+        self.assertEqual(Pitch.create('G#', 4).name, 'G#')
+
+        self.assertEqual(len({Pitch('C#', 4), Pitch('Db', 4), Pitch(midi=61), Pitch(midi=62)}), 2)
+        self.assertEqual({p: 1}[Pitch(midi=69)], 1)
+        self.assertNotEqual(p, 'z')
+
+        with self.assertRaises(AttributeError):
+            p.value = 70
+        with self.assertRaises(AttributeError):
+            p.extra = 1
+        self.assertEqual(pickle.loads(pickle.dumps(p)), p)
+
+        hits = Pitch.cache_info().hits
+        Pitch.create('A', 4)
+        self.assertEqual(Pitch.cache_info().hits, hits + 1)
+        self.assertTrue(0.0 < Pitch.hit_rate() <= 1.0)
+
 
 if __name__ == '__main__':
     unittest.main()
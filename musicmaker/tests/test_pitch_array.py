@@ -0,0 +1,49 @@
+import unittest
+import numpy
+
+from musicmaker.theory.pitch_array import PitchArray, frequency_table
+from musicmaker.theory.pitch import Pitch
+from musicmaker.theory.chord import Chord
+from musicmaker.theory.scale import Scale
+from musicmaker.theory.staff import Staff
+
+
+class PitchArrayTestCase(unittest.TestCase):
+    def test_pitch_array(self):
+        pitches = [Pitch.create(midi=midi) for midi in range(-1, 128)]
+        array = PitchArray.from_pitches(pitches + ['z'])
+        self.assertEqual(len(array), 129)
+        self.assertEqual(array.to_pitches(), pitches)
+        self.assertEqual(array[5], pitches[5])
+        self.assertEqual(list(array.names()), [str(pitch) for pitch in pitches])
+        self.assertEqual(list(array.names(sharp=True)), [str(pitch.sharp_normal()) for pitch in pitches])
+        numpy.testing.assert_array_equal(array.freqs(), [pitch.freq() for pitch in pitches])
+        numpy.testing.assert_array_equal(array[1:].freqs(), frequency_table(440))
+
+        numpy.testing.assert_array_equal(array.transpose(-3).midi, [pitch.transpose(-3).value for pitch in pitches])
+        numpy.testing.assert_array_equal(array.raise_octave(-1).midi, array.midi - 12)
+        numpy.testing.assert_array_equal(array[:3].transpose([0, 1, 2]).midi, [-1, 1, 3])
+        self.assertEqual(array.set_octave(2).to_pitches(), [pitch.set_octave(2) for pitch in pitches])
+
+        tuned = PitchArray([69], 432)
+        self.assertEqual(tuned.freqs()[0], 432)
+        self.assertEqual(tuned[0].tuning, 432)
+
+    def test_bulk(self):
+        chord = Chord('Cmaj7')
+        self.assertEqual(chord.pitch_array().to_pitches(), chord.get_notes())
+
+        scale = Scale(Pitch('D', 3), 'MelodicMinor')
+        nums = [1, 3, 9, -1, -4, -10]
+        self.assertEqual(scale.pitch_array(nums).to_pitches(), [scale.get_pitch(num) for num in nums])
+        self.assertEqual(len(scale.pitch_array()), 8)
+
+        staff = Staff()
+        staff.add(chord.get_notes(), 2, line=1)
+        staff.add([], 1, line=2)
+        staff.add([Pitch('E', 2)], 1, line=2)
+        self.assertEqual(list(staff.pitch_array().names()), ['C4', 'E4', 'G4', 'B4', 'E2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import numpy
+import time
+
+from musicmaker.sound.backend import NullBackend
+from musicmaker.sound.playback import Playback, RingBuffer
+
+
+class PlaybackTestCase(unittest.TestCase):
+    def setUp(self):
+        self.audio = numpy.arange(10000, dtype=numpy.float32)
+
+    def source(self):
+        for start in range(0, len(self.audio), 1000):
+            yield self.audio[start:start + 1000]
+
+    # Plays the part of the output device, which never asks for more than is buffered here
+    def pull(self, playback, frame_count):
+        while playback.ring.available() < frame_count and not playback.finished:
+            time.sleep(0.001)
+        return playback.callback(frame_count)
+
+    def test_ring_buffer(self):
+        ring = RingBuffer(8)
+        self.assertEqual(ring.write(numpy.arange(5)), 5)
+        numpy.testing.assert_array_equal(ring.read(3), [0, 1, 2])
+        self.assertEqual(ring.write(numpy.arange(5, 12)), 6)
+        self.assertEqual(ring.space(), 0)
+        numpy.testing.assert_array_equal(ring.read(10), [3, 4, 5, 6, 7, 8, 9, 10])
+        self.assertEqual(len(ring.read(1)), 0)
+
+        # Samples from before a clear are dropped
+        generation = ring.generation
+        ring.clear()
+        self.assertEqual(ring.write(numpy.arange(4), generation=generation), 0)
+        self.assertEqual(ring.write(numpy.arange(4), generation=ring.generation), 4)
+
+    def test_playback(self):
+        playback = Playback(self.source, 44100, buffer_frames=4096, prebuffer_frames=2048).start()
+        self.assertGreaterEqual(playback.ring.available(), 2048)
+
+        out = []
+        done = False
+        while not done:
+            data, done = self.pull(playback, 512)
+            out.append(data)
+        out = numpy.concatenate(out)
+
+        self.assertTrue(playback.wait())
+        playback.stop()
+        numpy.testing.assert_array_equal(out[:len(self.audio)], self.audio)
+        self.assertFalse(numpy.any(out[len(self.audio):]))
+        self.assertFalse(playback.is_playing())
+        self.assertEqual(playback.metrics()['frames_played'], len(self.audio))
+        self.assertEqual(playback.metrics()['underruns'], 0)
+
+    def test_loop_and_seek(self):
+        closed = []
+        playback = Playback(self.source, 44100, loop=True, buffer_frames=4096).start()
+        playback.on_close(lambda: closed.append(True))
+
+        out = []
+        for _ in range(60):
+            data, done = self.pull(playback, 500)
+            self.assertFalse(done)
+            out.append(data)
+        numpy.testing.assert_array_equal(numpy.concatenate(out), numpy.tile(self.audio, 3))
+
+        playback.seek(9000)
+        expected = numpy.concatenate((self.audio[9000:], self.audio[:500]))
+        numpy.testing.assert_array_equal(self.pull(playback, 1500)[0], expected)
+        self.assertEqual(playback.metrics()['position'], 10500)
+
+        playback.stop()
+        data, done = playback.callback(100)
+        self.assertTrue(done)
+        self.assertEqual(closed, [True])
+
+        playback = Playback(lambda: iter([]), 44100).start()
+        self.assertTrue(playback.callback(10)[1])
+        playback.stop()
+
+        # Looping nothing finishes instead of spinning
+        playback = Playback(lambda: iter([numpy.zeros(0)]), 44100, loop=True).start()
+        self.assertTrue(playback.callback(10)[1])
+        playback.stop()
+
+        # Reading past what is buffered counts as an underrun
+        playback = Playback(self.source, 44100, buffer_frames=1000).start()
+        playback.ring.clear()
+        playback.callback(2000)
+        self.assertEqual(playback.underruns, 1)
+        playback.stop()
+
+    def test_seek_after_end(self):
+        playback = Playback(self.source, 40000, buffer_frames=4096, prebuffer_frames=2048).start()
+        playback.open_output(NullBackend(), 1000)
+        self.assertTrue(playback.wait(2))
+        self.assertFalse(playback.is_playing())
+
+        playback.seek(8000)
+        self.assertTrue(playback.is_playing())
+        self.assertTrue(playback.wait(2))
+        self.assertFalse(playback.is_playing())
+        self.assertEqual(playback.metrics()['position'], len(self.audio))
+        self.assertEqual(playback.metrics()['frames_played'], len(self.audio) + 2000)
+        playback.stop()
+
+    def test_source_error(self):
+        def failing(blocks):
+            yield from list(self.source())[:blocks]
+            raise ValueError('bad block')
+
+        # Failing before prebuffering is done raises in start
+        with self.assertRaises(ValueError):
+            Playback(lambda: failing(1), 44100, buffer_frames=4096, prebuffer_frames=2048).start()
+
+        # Failing later ends playback and raises in wait, the ring being too small to get there before start returns
+        playback = Playback(lambda: failing(3), 44100, buffer_frames=2048, prebuffer_frames=1000).start()
+        done = False
+        while not done:
+            done = playback.callback(500)[1]
+        self.assertFalse(playback.is_playing())
+        with self.assertRaises(ValueError):
+            playback.wait(2)
+        playback.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
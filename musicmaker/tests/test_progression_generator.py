@@ -0,0 +1,101 @@
+import random
+import unittest
+import numpy
+
+from musicmaker.structure.alias_table import AliasTable
+from musicmaker.structure.weighteddigraph import WeightedDigraph
+from musicmaker.theory.major_progression_generator import MajorProgression
+from musicmaker.theory.progression_generator import ProgressionGenerator, inverse_weight
+from musicmaker.theory.pitch import Pitch
+
+
+class ProgressionGeneratorTestCase(unittest.TestCase):
+    def test_alias_table(self):
+        rng = random.Random(1)
+        weights = [5, 0, 1, 3, 1]
+        table = AliasTable(weights)
+        counts = [0] * len(weights)
+        for _ in range(100000):
+            counts[table.sample(rng)] += 1
+        for count, weight in zip(counts, weights):
+            self.assertAlmostEqual(count / 100000, weight / 10, delta=0.01)
+
+        self.assertEqual(AliasTable([2]).sample(rng), 0)
+        with self.assertRaises(ValueError):
+            AliasTable([0, 0])
+
+    def test_weighted_generate(self):
+        random.seed(3)
+        p = MajorProgression(Pitch.create('C'), MajorProgression.position_dict['I'])
+        node = p.get(MajorProgression.position_dict['I'])
+        neighbors, table = node.sampler(inverse_weight)
+        self.assertIs(node.sampler(inverse_weight)[1], table)
+        self.assertEqual(neighbors, node.neighbors())
+
+        counts = {}
+        for _ in range(20000):
+            value = node.sample(inverse_weight).value
+            counts[value.name] = counts.get(value.name, 0) + 1
+        total = sum(inverse_weight(weight) for weight in node.adj.values())
+        self.assertAlmostEqual(counts['V'] / 20000, 1 / total, delta=0.02)
+        self.assertAlmostEqual(counts['I/3'] / 20000, 0.2 / total, delta=0.01)
+
+        progression = p.generate(16, weighted=True, probability=lambda weight: 1.0 if weight == 0 else 0.0)
+        self.assertEqual(len(progression.note_groups), 16)
+
+        # Only the latest mapping keeps a table
+        self.assertIsNot(node.sampler(inverse_weight)[1], table)
+        table = node.sampler(inverse_weight)[1]
+        self.assertIs(node.cached_sampler[0], inverse_weight)
+
+        # Adding an edge drops the compiled table
+        p.add_transition_edge('I', 'VI', ProgressionGenerator.Weight.PRIMARY)
+        self.assertIsNot(node.sampler(inverse_weight)[1], table)
+
+    def test_compile(self):
+        p = MajorProgression(Pitch.create('C'), MajorProgression.position_dict['I'])
+        graph = p.compile()
+        self.assertEqual(len(graph), len(p.V))
+        self.assertEqual(graph.values, MajorProgression(start=MajorProgression.position_dict['V']).compile().values)
+        self.assertEqual(graph.values, sorted(graph.values))
+
+        for value, node in p.V.items():
+            i = graph.ids[value]
+            self.assertEqual([graph.values[j] for j in graph.neighbors(i)], [n.value for n in node.neighbors()])
+            self.assertEqual(list(graph.edge_weights(i)), [node.adj[n] for n in node.neighbors()])
+        numpy.testing.assert_array_equal(graph.outdegree(), [p.V[value].outdegree() for value in graph.values])
+
+        weights = graph.weight_matrix()
+        i, j = graph.ids[MajorProgression.position_dict['I']], graph.ids[MajorProgression.position_dict['I/3']]
+        self.assertEqual(weights[i, j], ProgressionGenerator.Weight.UNCOMMON)
+        self.assertEqual(weights[j, i], numpy.inf)
+
+        uniform = graph.transition_matrix()
+        numpy.testing.assert_allclose(uniform.sum(axis=1), 1.0)
+        weighted = graph.transition_matrix(inverse_weight)
+        neighbors, table = p.V[graph.values[i]].sampler(inverse_weight)
+        numpy.testing.assert_allclose(weighted[i, [graph.ids[n.value] for n in neighbors]], table.probabilities)
+
+        hops = graph.hops(graph.values[i])
+        self.assertEqual(hops[i], 0)
+        self.assertEqual(hops[j], 1)
+        self.assertTrue(numpy.all(hops >= 0))
+        numpy.testing.assert_allclose(graph.distribution(graph.values[i], 1), uniform[i])
+
+        path = graph.walk(graph.values[i], 50, inverse_weight, numpy.random.default_rng(2))
+        self.assertEqual(len(path), 50)
+        for head, tail in zip(path, path[1:]):
+            self.assertIn(p.V[tail], p.V[head].adj)
+
+        digraph = WeightedDigraph()
+        digraph.add_edge(1, 2)
+        digraph.add_edge(1, 3)
+        sinks = digraph.compile()
+        for seed in range(20):
+            self.assertIn(sinks.walk(1, 2, rng=numpy.random.default_rng(seed)), [[1, 2], [1, 3]])
+        with self.assertRaises(ValueError):
+            sinks.walk(1, 6, rng=numpy.random.default_rng(0))
+
+
+if __name__ == '__main__':
+    unittest.main()
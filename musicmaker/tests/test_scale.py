@@ -1,4 +1,5 @@
 import unittest
+import numpy
 
 from musicmaker.theory.scale import Scale
 from musicmaker.theory.pitch import Pitch
@@ -21,6 +22,13 @@ class ScaleTestCase(unittest.TestCase):
         for i, note in notes:
             self.assertEqual(str(s.get_pitch(i)), note)
 
+    def test_get_midi(self):
+        nums = numpy.arange(-40, 41)
+        for mode in Scale.modes:
+            s = Scale(Pitch('D', 3), mode)
+            numpy.testing.assert_array_equal(s.get_midi(nums), [s.get_pitch(int(num)).value for num in nums])
+        numpy.testing.assert_array_equal(Scale(Pitch('C'), 'MelodicMinor').get_midi([[6, -2], [0, -9]]), [[69, 56], [60, 44]])
+
 
 if __name__ == '__main__':
     unittest.main()
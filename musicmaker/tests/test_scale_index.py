@@ -0,0 +1,49 @@
+import unittest
+import numpy
+
+from musicmaker.theory.scale_index import ScaleIndex
+from musicmaker.theory.scale import Scale
+from musicmaker.theory.pitch import Pitch
+
+
+class ScaleIndexTestCase(unittest.TestCase):
+    def test_queries(self):
+        index = ScaleIndex.default()
+        self.assertEqual(len(index), 12 * len(Scale.modes))
+
+        notes = [Pitch('C', 4), Pitch('E', 4), Pitch('G', 4), Pitch('B', 4), Pitch('F#', 5)]
+        containing = index.containing(notes)
+        self.assertIn(('G', 'Major'), [(match.root, match.mode) for match in containing])
+        self.assertIn(('C', 'Lydian'), [(match.root, match.mode) for match in containing])
+        self.assertNotIn(('C', 'Major'), [(match.root, match.mode) for match in containing])
+
+        # Brute force over every scale agrees
+        for i in range(len(index)):
+            scale = index.scale(i)
+            classes = {scale.get_pitch(n).value % 12 for n in range(-12, 13)}
+            expected = all(note.value % 12 in classes for note in notes)
+            self.assertEqual(expected, (index.roots[i], index.modes[i]) in
+                             [(match.root, match.mode) for match in containing], str(scale))
+
+        best = index.best_fit(notes)
+        self.assertEqual(len(best), len(containing))
+        self.assertIn(('C', 'Chinese', 0, 0), best[:6])
+        self.assertEqual([match.extra for match in best], sorted(match.extra for match in best))
+
+        nearest = index.nearest([Pitch(midi=60 + step) for step in [0, 2, 4, 5, 7, 9, 10, 11]], 2)
+        self.assertEqual((nearest[0].root, nearest[0].mode), ('C', 'BebopDominant'))
+
+        sets = [notes, [Pitch('C', 4), Pitch('Db', 4), Pitch('D', 4), Pitch('Eb', 4)], 0b101010110101]
+        many = index.containing_many(sets)
+        self.assertEqual(many.shape, (3, len(index)))
+        for row, pitches in zip(many, sets):
+            self.assertEqual([(index.roots[i], index.modes[i]) for i in numpy.flatnonzero(row)],
+                             [(match.root, match.mode) for match in index.containing(pitches)])
+        nearest = index.nearest_many(sets)
+        self.assertEqual((index.roots[nearest[2]], index.modes[nearest[2]]), ('C', 'Ionian'))
+        for i, pitches in zip(nearest, sets):
+            self.assertEqual((index.roots[i], index.modes[i]), index.nearest(pitches, 1)[0][:2])
+
+
+if __name__ == '__main__':
+    unittest.main()
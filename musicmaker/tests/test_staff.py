@@ -0,0 +1,61 @@
+import unittest
+
+from musicmaker.theory.staff import Staff
+from musicmaker.theory.pitch import Pitch
+
+
+class StaffTestCase(unittest.TestCase):
+    def setUp(self):
+        self.staff = Staff()
+        for n in range(8):
+            self.staff.add([Pitch(midi=60 + n)], 1, line=1)
+        self.staff.add([Pitch(midi=48)], 4, line=2)
+        self.staff.add([], 2, line=2)
+        self.staff.add_multi_length([(Pitch(midi=50), 1), (Pitch(midi=53), 2)], line=2)
+
+    def test_index(self):
+        index = self.staff.index()
+        self.assertIs(index, self.staff.index())
+        self.assertEqual(len(index), 13)
+        self.assertEqual(index.total_beats, 8)
+        self.assertEqual(list(index.onsets), sorted(index.onsets))
+        self.assertEqual([(event.onset, event.line) for event in index.events_between(4, 6)],
+                         [(4, 1), (4, 2), (5, 1)])
+        self.assertEqual([event.onset for event in index.events_between(6, line='multi_length2.0')], [6])
+        self.assertEqual(index.seek(6.5), index.seek(7))
+
+        # Iterators are independent and the staff itself is left alone
+        first = index.events_between()
+        second = index.events_between(3)
+        self.assertEqual(next(first).onset, 0)
+        self.assertEqual(next(second).onset, 3)
+        self.assertEqual(next(first).onset, 0)
+        self.assertEqual(len(self.staff.lines[2].note_groups), 3)
+
+        # Iterating the staff pads line 2 with a rest, which a new index picks up
+        groups = list(self.staff)
+        self.assertIsNot(index, self.staff.index())
+        self.assertEqual(len(index), 13)
+        self.assertEqual([group for _, group in self.staff.index().groups()], groups)
+
+    def test_queries(self):
+        def values(events):
+            return [(event.line, [note.value for note in event.notes]) for event in events]
+
+        self.assertEqual(values(self.staff.sounding(4.5)), [(1, [64])])
+        self.assertEqual(values(self.staff.sounding(6)), [(1, [66]), (2, [50]), ('multi_length2.0', [53])])
+        self.assertEqual(len(self.staff.sounding(4.5, rests=True)), 3)
+        self.assertEqual(self.staff.sounding(8), [])
+
+        self.assertEqual(values(self.staff.overlapping(3.5, 5)), [(1, [63]), (1, [64]), (2, [48])])
+        self.assertEqual(values(self.staff.overlapping(7, 7.5)), [(1, [67]), ('multi_length2.0', [53])])
+        self.assertEqual(self.staff.overlapping(2, 2), [])
+
+        # The index follows additions
+        self.staff.add([Pitch(midi=40)], 2, line=2)
+        self.assertEqual(values(self.staff.sounding(7.5)), [(1, [67]), (2, [40]), ('multi_length2.0', [53])])
+        self.assertEqual(self.staff.sounding(8.5)[0].onset, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import numpy
+import io
+
+from musicmaker.sound.staffplayer import StaffPlayer
+from musicmaker.theory.staff import Staff
+from musicmaker.theory.scale import Scale
+from musicmaker.theory.pitch import Pitch
+
+
+class StaffPlayerTestCase(unittest.TestCase):
+    def setUp(self):
+        scale = Scale(Pitch('A', 2), 'HarmonicMinor')
+        self.staff = Staff(tempo=240)
+        for n in [8, 6, 5, 7, 8, 9, 7, 8]:
+            self.staff.add([scale.get_pitch(n), scale.get_pitch(n+2), scale.get_pitch(n+4)], 2, line=1)
+        for n in [25, 24, 20, 19, 18, 19, 16, 15]:
+            self.staff.add([scale.get_pitch(n)], 1, line=2)
+            self.staff.add([], 0.5, line=2)
+            self.staff.add([scale.get_pitch(n-2)], 0.5, line=2)
+
+    def make_player(self):
+        player = StaffPlayer(self.staff, 8000)
+        player.add_sound(1, player.synth.chime)
+        player.add_sound(2, player.synth.chime_soft, wavetable=True)
+        return player
+
+    def test_stream(self):
+        player = self.make_player()
+        player.prepare()
+        expected = player.mix()
+
+        for block_size in [1000, 4096]:
+            blocks = list(self.make_player().stream(block_size))
+            self.assertTrue(all(len(block) == block_size for block in blocks[:-1]))
+            numpy.testing.assert_array_equal(numpy.concatenate(blocks), expected)
+
+    def test_save(self):
+        # The header is written once up front, so saving works without seeking back
+        class Unseekable(io.BytesIO):
+            def seek(self, *args):
+                raise io.UnsupportedOperation('seek')
+
+        player = self.make_player()
+        player.prepare()
+        num_frames = len(player.mix())
+        for player in [player, self.make_player()]:
+            file = Unseekable()
+            player.save(file)
+            self.assertEqual(player.num_frames(), num_frames)
+            self.assertEqual(len(file.getvalue()), 44 + 2 * num_frames)
+
+        # Sounds longer than their notes stop at the end of the staff either way
+        files = []
+        for prepare in [False, True]:
+            player = self.make_player()
+            player.add_sound(2, lambda f, d, v: numpy.full(5000, 0.5, dtype=numpy.float32))
+            if prepare:
+                player.prepare()
+            file = Unseekable()
+            player.save(file)
+            self.assertEqual(len(file.getvalue()), 44 + 2 * num_frames)
+            files.append(numpy.frombuffer(file.getvalue()[44:], '<i2'))
+        numpy.testing.assert_allclose(files[0], files[1], atol=1)
+
+    def test_prepare_parallel(self):
+        player = self.make_player()
+        player.prepare()
+        expected = player.mix()
+
+        for processes, start_method in [(2, None), (3, None), (2, 'spawn')]:
+            player = self.make_player()
+            player.prepare(processes, start_method)
+            numpy.testing.assert_array_equal(player.mix(), expected)
+
+        # User sounds work in the workers too
+        player = self.make_player()
+        player.add_sound(1, lambda f, d, v: player.synth.release(player.synth.sine_tone(f, d, v)))
+        player.prepare(2, 'spawn')
+        parallel = player.mix()
+        player.clear()
+        player.prepare()
+        numpy.testing.assert_array_equal(parallel, player.mix())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import numpy
+
+from musicmaker.sound.envelope import CURVE_CACHE, Envelope
+from musicmaker.sound.synth import Synth
+from musicmaker.sound.wavetable import WavetableSynth
+
+
+class SynthTestCase(unittest.TestCase):
+    def test_batch_chord(self):
+        synth = Synth(44100)
+        freqs = [110.0, 130.81, 164.81, 196.0, 246.94, 293.66, 329.63, 392.0]
+
+        for effect in [synth.sine_tone, synth.clean_sine, synth.harmonics, synth.chime, synth.chime_soft]:
+            for num_notes in [2, 3, 6, 8]:
+                for duration_ms in [250, 1000]:
+                    expected = effect(freqs[0], duration_ms)
+                    for freq in freqs[1:num_notes]:
+                        expected += effect(freq, duration_ms)
+
+                    numpy.testing.assert_array_equal(synth.chord(freqs[:num_notes], effect, duration_ms), expected)
+
+    def test_chord_unvectorized_effect(self):
+        synth = Synth(44100)
+
+        def effect(f, d, v):
+            return synth.release(synth.sine_tone(f, d, v))
+        numpy.testing.assert_array_equal(synth.chord([440.0, 880.0], effect),
+                                         effect(440.0, 1000, 1.0) + effect(880.0, 1000, 1.0))
+
+    def test_envelope(self):
+        points = {0.0: 0.0, 0.5: 0.75, 0.8: 0.4, .98: 0.1, 1.0: 0.0}
+        envelope = Envelope.create(points)
+        self.assertIs(envelope, Envelope.create(dict(reversed(list(points.items())))))
+
+        for num_samples in [1, 10, 44100]:
+            curve = envelope.curve(num_samples)
+            self.assertIs(curve, envelope.curve(num_samples))
+            self.assertFalse(curve.flags.writeable)
+            self.assertEqual(len(curve), num_samples)
+            self.assertEqual(curve[0], 0.0)
+
+        # Curves longer than the cache's byte budget are rendered each time instead of kept
+        long_samples = CURVE_CACHE.max_bytes // 8 + 1
+        curve = envelope.curve(long_samples)
+        self.assertEqual(len(curve), long_samples)
+        self.assertIsNot(curve, envelope.curve(long_samples))
+        self.assertLessEqual(CURVE_CACHE.nbytes, CURVE_CACHE.max_bytes)
+
+        curve = envelope.curve(100)
+        self.assertAlmostEqual(curve[50], 0.75)
+        self.assertAlmostEqual(curve[65], 0.575)
+        self.assertAlmostEqual(curve[99], 0.05)
+
+        synth = Synth(44100)
+        data = synth.sine_tone(440.0)
+        numpy.testing.assert_allclose(synth.shape(data, points), synth.shape(data, points, kind='linear'))
+        numpy.testing.assert_allclose(synth.shape(data, points), synth.shape(data, points, kind='quadratic'), atol=0.05)
+
+    def test_wavetable(self):
+        synth = Synth(44100)
+        wavetable_synth = WavetableSynth(44100)
+
+        for effect in ['sine_tone', 'harmonics', 'harmonics_soft', 'chime', 'chime_soft']:
+            for freq in [55.0, 440.0, 3000.0]:
+                numpy.testing.assert_allclose(getattr(wavetable_synth, effect)(freq, 500),
+                                              getattr(synth, effect)(freq, 500), atol=1e-6)
+
+        # Partials above nyquist are dropped, per note when rendering a chord
+        numpy.testing.assert_allclose(wavetable_synth.harmonics(8000.0, 100), synth.harmonics_soft(8000.0, 100), atol=1e-6)
+        numpy.testing.assert_allclose(wavetable_synth.chord([440.0, 8000.0], wavetable_synth.harmonics, 100),
+                                      synth.harmonics(440.0, 100) + synth.harmonics_soft(8000.0, 100), atol=1e-6)
+
+    def test_dtype(self):
+        synth64 = Synth(44100, numpy.float64)
+        freqs = [110.0, 440.0, 3520.0]
+
+        for synth in [Synth(44100), WavetableSynth(44100)]:
+            self.assertEqual(synth.dtype, numpy.float32)
+            for effect in ['sine_tone', 'clean_sine', 'harmonics', 'chime', 'chime_soft']:
+                data = synth.chord(freqs, getattr(synth, effect), 20000)
+                self.assertEqual(data.dtype, numpy.float32)
+                numpy.testing.assert_allclose(data, synth64.chord(freqs, getattr(synth64, effect), 20000), atol=1e-5)
+            self.assertEqual(synth.shape(data, {0.0: 1.0, 0.5: 0.5, 1.0: 0.0}, kind='quadratic').dtype, numpy.float32)
+
+
+if __name__ == '__main__':
+    unittest.main()
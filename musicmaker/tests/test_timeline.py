@@ -0,0 +1,50 @@
+import unittest
+
+from musicmaker.sound.staffplayer import StaffPlayer
+from musicmaker.sound.timeline import Timeline
+from musicmaker.theory.staff import Staff
+from musicmaker.theory.pitch import Pitch
+
+
+class TimelineTestCase(unittest.TestCase):
+    def setUp(self):
+        self.staff = Staff(tempo=100)
+        for _ in range(30):
+            self.staff.add([Pitch('A', 4)], 1/3, line=1)
+        self.staff.add([Pitch('E', 4)], 4, line=2)
+        self.staff.add([], 6, line=2)
+        self.staff.add([Pitch('C', 4)], 1, line=2)
+
+    def test_events(self):
+        timeline = Timeline(self.staff, 44100)
+        events = list(timeline)
+        self.assertEqual([event.start for event in events], sorted(event.start for event in events))
+        self.assertEqual(len(events), 32)
+
+        # Line 1 ends exactly on beat 10, where line 2 starts its last note after a rest
+        line1 = list(timeline.line_events(1))
+        self.assertEqual(line1[-1].end, 264600)
+        self.assertTrue(all(a.end == b.start for a, b in zip(line1, line1[1:])))
+        self.assertEqual(list(timeline.line_events(2))[-1].start, 264600)
+        self.assertEqual(timeline.end(), 264600 + 26460)
+
+    def test_freqs(self):
+        # Every note's reference pitch is kept when they differ
+        self.staff.add([Pitch('A', 4, 432), Pitch('C', 5), 'z'], 1, line=3)
+        timeline = Timeline(self.staff, 44100)
+        for event, staff_event in zip(timeline, [e for e in self.staff.index() if e.sounding()]):
+            self.assertEqual(event.freqs, [note.freq() for note in staff_event.notes if hasattr(note, 'freq')])
+        self.assertEqual(list(timeline.line_events(3))[0].freqs, [432.0, Pitch('C', 5).freq()])
+
+    def test_rests_are_skipped(self):
+        player = StaffPlayer(self.staff, 8000)
+        player.prepare()
+        self.assertEqual(len(player.audio[2]), 2)
+        self.assertEqual(len(player.mix()), player.timeline().end())
+        events = list(player.timeline().line_events(1))
+        self.assertEqual([(offset, len(data)) for offset, data in player.audio[1]],
+                         [(event.start, event.end - event.start) for event in events])
+
+
+if __name__ == '__main__':
+    unittest.main()
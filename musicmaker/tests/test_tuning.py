@@ -0,0 +1,75 @@
+import io
+import unittest
+import numpy
+
+from musicmaker.theory.tuning import Tuning
+from musicmaker.theory.pitch_array import PitchArray, frequency_table
+from musicmaker.theory.pitch import Pitch
+from musicmaker.theory.staff import Staff
+from musicmaker.sound.timeline import Timeline
+
+SCALA = """! meanquar.scl
+!
+1/4-comma meantone scale. Pietro Aaron's temperament (1523)
+ 12
+!
+ 76.04900
+ 193.15686
+ 310.26471
+ 5/4
+ 503.42157
+ 579.47057
+ 696.57843
+ 25/16
+ 889.73529
+ 1006.84314
+ 1082.89214
+ 2/1
+"""
+
+
+class TuningTestCase(unittest.TestCase):
+    def test_tunings(self):
+        numpy.testing.assert_allclose(Tuning.equal().table(), frequency_table(440), rtol=1e-12)
+        self.assertIs(Tuning.just().table(), Tuning.just().table())
+        self.assertFalse(Tuning.just().table().flags.writeable)
+
+        just = Tuning.just()
+        self.assertAlmostEqual(just.freq(60), Pitch('C', 4).freq())
+        self.assertAlmostEqual(just.freq(64) / just.freq(60), 5 / 4)
+        self.assertAlmostEqual(just.freq(79) / just.freq(60), 3)
+        self.assertAlmostEqual(just.freq(-3) / just.freq(9), 1 / 2)
+
+        just_d = Tuning.just('D')
+        self.assertAlmostEqual(just_d.freq(62), Pitch('D', 4).freq())
+        self.assertAlmostEqual(just_d.freq(69) / just_d.freq(62), 3 / 2)
+
+        pythagorean = Tuning.pythagorean()
+        self.assertAlmostEqual(pythagorean.freq(67) / pythagorean.freq(60), 3 / 2)
+        self.assertAlmostEqual(pythagorean.freq(62) / pythagorean.freq(60), 9 / 8)
+
+        meantone = Tuning.meantone()
+        self.assertAlmostEqual(meantone.freq(64) / meantone.freq(60), 5 / 4)
+        scala = Tuning.from_scala(io.StringIO(SCALA))
+        self.assertEqual(len(scala), 12)
+        numpy.testing.assert_allclose(scala.table(), meantone.table(), rtol=1e-7)
+
+        quarter_tones = Tuning.from_cents([50.0 * i for i in range(24)], tonic=69)
+        self.assertAlmostEqual(quarter_tones.freq(69 + 24), 880)
+        numpy.testing.assert_allclose(PitchArray([69, 70, 93]).freqs(quarter_tones),
+                                      [440, 440 * 2 ** (1 / 24), 880])
+
+        with self.assertRaises(ValueError):
+            Tuning.from_cents([100.0, 200.0])
+
+    def test_timeline(self):
+        staff = Staff()
+        staff.add([Pitch('C', 4), Pitch('E', 4)], 1)
+        event = next(iter(Timeline(staff, 8000, Tuning.just())))
+        self.assertAlmostEqual(event.freqs[1] / event.freqs[0], 5 / 4)
+        event = next(iter(Timeline(staff, 8000)))
+        self.assertEqual(event.freqs, [Pitch('C', 4).freq(), Pitch('E', 4).freq()])
+
+
+if __name__ == '__main__':
+    unittest.main()
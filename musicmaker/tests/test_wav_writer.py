@@ -0,0 +1,70 @@
+import unittest
+import struct
+import numpy
+import wave
+import io
+
+from musicmaker.sound.wav_writer import WavWriter
+
+
+class WavWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.frames = numpy.sin(numpy.arange(10001) * 0.01).reshape(-1, 1) * [1.0, -0.5]
+
+    def test_pcm(self):
+        for sample_format, sampwidth, dtype in [('pcm16', 2, '<i2'), ('pcm24', 3, None)]:
+            for nframes in [len(self.frames), None]:
+                file = io.BytesIO()
+                with WavWriter(file, 44100, 2, sample_format, nframes, block_size=1000) as writer:
+                    writer.write(self.frames[:5000])
+                    writer.write(self.frames[5000:])
+
+                file.seek(0)
+                with wave.open(file, 'rb') as wav_file:
+                    self.assertEqual(wav_file.getparams()[:4], (2, sampwidth, 44100, len(self.frames)))
+                    data = wav_file.readframes(len(self.frames))
+
+                max_value = 2 ** (sampwidth * 8 - 1) - 1
+                if dtype is None:
+                    data = numpy.frombuffer(data, numpy.uint8).reshape(-1, 3)
+                    data = (data[:, 0].astype(numpy.int32) | data[:, 1].astype(numpy.int32) << 8
+                            | data[:, 2].astype(numpy.int8).astype(numpy.int32) << 16)
+                else:
+                    data = numpy.frombuffer(data, dtype)
+                numpy.testing.assert_array_equal(data.reshape(-1, 2), numpy.rint(self.frames * max_value))
+
+    def test_float(self):
+        file = io.BytesIO()
+        with WavWriter(file, 48000, 2, 'float32', len(self.frames)) as writer:
+            writer.write(self.frames)
+
+        data = file.getvalue()
+        self.assertEqual(data[:4], b'RIFF')
+        self.assertEqual(struct.unpack('<I', data[4:8])[0], len(data) - 8)
+        self.assertEqual(struct.unpack('<HHI', data[20:28]), (3, 2, 48000))
+        self.assertEqual(data[38:42], b'fact')
+        self.assertEqual(struct.unpack('<I', data[46:50])[0], len(self.frames))
+        self.assertEqual(data[50:54], b'data')
+        numpy.testing.assert_array_equal(numpy.frombuffer(data[58:], '<f4').reshape(-1, 2),
+                                         self.frames.astype(numpy.float32))
+
+    def test_clip_and_dither(self):
+        file = io.BytesIO()
+        with WavWriter(file, 44100, 1, 'pcm16', 4) as writer:
+            writer.write([2.0, -2.0, 0.0, 0.5])
+        numpy.testing.assert_array_equal(numpy.frombuffer(file.getvalue()[44:], '<i2'), [32767, -32768, 0, 16384])
+
+        file = io.BytesIO()
+        with WavWriter(file, 44100, 1, 'pcm16', 10000, dither=True) as writer:
+            writer.write(numpy.zeros(10000))
+        data = numpy.frombuffer(file.getvalue()[44:], '<i2')
+        self.assertTrue(numpy.all(numpy.abs(data) <= 1))
+        self.assertTrue(numpy.any(data != 0))
+
+        with self.assertRaises(ValueError):
+            with WavWriter(io.BytesIO(), 44100, 1, 'pcm16', 10) as writer:
+                writer.write(numpy.zeros(5))
+
+
+if __name__ == '__main__':
+    unittest.main()
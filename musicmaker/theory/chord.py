@@ -2,10 +2,9 @@ import functools
 import argparse
 import re
 
-from musicmaker.sound.staffplayer import StaffPlayer
 from .staff import Staff
 from .scale import Scale
-from .pitch import Pitch
+from .pitch import Pitch, NOTE_MAP, REV_NOTE_MAP
 
 CHORD_REGEX = (
     r'(?P<key>[A-G](##?|bb?)?)'
@@ -26,6 +25,38 @@ REDUCED_CHORD_REGEX = (
 )
 
 
+class ChordTemplate:
+    # The MIDI values of a chord built on C and its bass value, which every other root only shifts
+    def __init__(self, values, bass):
+        self.values = tuple(values)
+        self.bass = bass
+
+    # Chords are voiced from the bass at a fixed octave, so roots that move the bass past B drop an octave
+    def shift(self, root):
+        root = root % 12
+        return root - 12 if self.bass % 12 + root >= 12 else root
+
+    def transpose(self, root):
+        shift = self.shift(root)
+        return [value + shift for value in self.values]
+
+    # MIDI values shaped (roots x notes) for many root pitch classes at once
+    def transpose_many(self, roots):
+        import numpy
+
+        roots = numpy.asarray(roots) % 12
+        shifts = roots - 12 * (self.bass % 12 + roots >= 12)
+        return numpy.asarray(self.values) + shifts.reshape(-1, 1)
+
+
+# Parses a chord suffix once for every root, see Chord.compile.
+# The root is C spelled Dbb, as with a shorter spelling the suffix's leading accidentals would join the root
+@functools.lru_cache(1024)
+def chord_template(suffix, octave=4):
+    chord = Chord('Dbb' + suffix, octave)
+    return ChordTemplate([note.value for note in chord.notes], chord.bass.value)
+
+
 class Chord:
     def create(name=None, octave=4, key="", kind="", add="", adjust="", bass="", adjust2=""):
         if name is None:
@@ -34,11 +65,41 @@ class Chord:
 
     @functools.lru_cache(256)
     def _cached_create(name=None, octave=4):
-        return Chord(name, octave)
-
-    def __init__(self, name=None, octave=4, key="", kind="", add="", adjust="", bass="", adjust2=""):
+        return Chord.compile(name, octave)
+
+    # Splits a chord name into its root and a suffix that means the same on any root,
+    # with a bass note given by name turned into the one at the same interval above C
+    @staticmethod
+    def split(name):
+        m = re.match(CHORD_REGEX, name)
+        if m is None or m.group(0) != name:
+            raise ValueError(f"Invalid chord: {name}")
+        key = m.group('key')
+        bass = m.group('bass')
+        if len(bass) > 1 and 'A' <= bass[1] <= 'G':
+            bass = '/' + REV_NOTE_MAP[(NOTE_MAP[bass[1:]] - NOTE_MAP[key]) % 12]
+        return key, f"{m.group('kind')}{m.group('add')}{m.group('adjust')}{bass}{m.group('adjust2')}"
+
+    # Same notes as Chord(name, octave), transposed from a template shared by all roots
+    @staticmethod
+    def compile(name, octave=4):
+        key, suffix = Chord.split(name)
+        template = chord_template(suffix, octave)
+        shift = template.shift(NOTE_MAP[key])
+        notes = [Pitch.create(midi=value + shift) for value in template.values]
+        return Chord(name, octave, notes=notes, bass_note=Pitch.create(midi=template.bass + shift))
+
+    def __init__(self, name=None, octave=4, key="", kind="", add="", adjust="", bass="", adjust2="", notes=None,
+                 bass_note=None):
         self.notes = []
 
+        if notes is not None:
+            self.name = name
+            self.notes = list(notes)
+            self.bass = bass_note
+            self.valid = True
+            return
+
         if name is None:
             self.name = f"{key}{kind}{add}{adjust}{bass}{adjust2}"
             adjust = adjust + adjust2
@@ -77,8 +138,14 @@ class Chord:
     def get_notes(self):
         return self.notes
 
+    def pitch_array(self):
+        from .pitch_array import PitchArray
+
+        return PitchArray.from_pitches(self.notes)
+
     def make(self, key, kind, add, adjust, bass, octave=4):  # noqa: C901
         self.valid = False
+        self.bass = None
 
         if not key:
             return
@@ -264,6 +331,7 @@ class Chord:
                     self.add(root.transpose(major_mode.find_step(int(add_arg)) + base_step_adjust))
 
         self.order(bass_note, octave)
+        self.bass = bass_note.set_octave(octave)
 
         self.notes.sort(key=lambda el: el.value)
         self.valid = True
@@ -309,6 +377,8 @@ if __name__ == '__main__':
             staff = Staff()
             staff.add(c.notes, 4)
 
+            from musicmaker.sound.staffplayer import StaffPlayer
+
             print('playing..', flush=True)
             player = StaffPlayer(staff)
             player.play()
@@ -0,0 +1,72 @@
+import collections
+import functools
+
+from .chord import Chord, chord_template
+from .pitch import REV_NOTE_MAP, pitch_class_mask, rotate_mask
+
+# Suffixes recognized by default, simplest first as earlier ones rank higher among chords with the same notes.
+# None starts with an accidental, which would read as part of the root
+CHORD_SUFFIXES = [
+    '', 'm', 'dim', 'aug', 'sus4', 'sus2', 'no3',
+    '7', 'maj7', 'm7', 'mM7', 'dim7', 'm7b5', '6', 'm6', 'aug7', '7sus4', '7sus2', '7b5', '7#5', 'maj7#5',
+    'add9', 'madd9', 'add11', '6add9', 'm6add9',
+    '7add9', 'maj7add9', 'm7add9', '7b9', '7#9', '7add11', 'm7add11', '7#11', 'maj7#11',
+    '7add13', 'maj7add13', 'm7add13', '7b13', '7b9#9',
+]
+
+ChordMatch = collections.namedtuple('ChordMatch', ['name', 'root', 'suffix', 'bass', 'inversion'])
+
+
+class ChordRecognizer:
+    # Every suffix on every root goes in one dict by pitch class set, so a lookup is a single probe
+    def __init__(self, suffixes=CHORD_SUFFIXES):
+        self.suffixes = list(suffixes)
+        self.index = {}
+        for rank, suffix in enumerate(self.suffixes):
+            # Intervals in the order the chord stacks up from its root, e.g. a ninth comes after the seventh
+            values = chord_template(Chord.split('C' + suffix)[1]).values
+            intervals = tuple(dict.fromkeys(value % 12 for value in values))
+            mask = sum(1 << interval for interval in intervals)
+            for root in range(12):
+                key = rotate_mask(mask, root)
+                if key not in self.index:
+                    self.index[key] = []
+                self.index[key].append((rank, root, suffix, intervals))
+
+    @staticmethod
+    @functools.lru_cache(1)
+    def default():
+        return ChordRecognizer()
+
+    # Ranked matches for exactly the pitch classes of pitches, the lowest pitch being the bass.
+    # Chords in root position come first, inversions are named with the bass like Cmaj7/E
+    def recognize(self, pitches, limit=None):
+        pitches = [pitch for pitch in pitches if hasattr(pitch, 'value')]
+        if not pitches:
+            return []
+        bass = min(pitch.value for pitch in pitches) % 12
+
+        matches = []
+        for rank, root, suffix, intervals in self.index.get(pitch_class_mask(pitches), []):
+            inversion = self.inversion(intervals, root, bass)
+            name = REV_NOTE_MAP[root] + suffix
+            if inversion > 0:
+                name += '/' + REV_NOTE_MAP[bass]
+            matches.append((inversion > 0, rank, ChordMatch(name, REV_NOTE_MAP[root], suffix, REV_NOTE_MAP[bass],
+                                                            inversion)))
+
+        matches.sort(key=lambda match: match[:2])
+        return [match for _, _, match in matches[:limit]]
+
+    # Which chord tone is in the bass, counting up from the root: 0 for root position, 1 for first inversion...
+    @staticmethod
+    def inversion(intervals, root, bass):
+        return intervals.index((bass - root) % 12)
+
+    # Names the notes sounding anywhere in [start, stop) of a staff
+    def recognize_staff(self, staff, start, stop, limit=None):
+        return self.recognize([note for event in staff.overlapping(start, stop) for note in event.notes], limit)
+
+    def best(self, pitches):
+        matches = self.recognize(pitches, 1)
+        return matches[0] if matches else None
@@ -2,7 +2,6 @@ import argparse
 import random
 import sys
 
-from musicmaker.sound.staffplayer import StaffPlayer
 from .progression_generator import ProgressionGenerator
 from .scale import Scale
 from .pitch import Pitch
@@ -139,6 +138,8 @@ if __name__ == '__main__':
                         help='The root of the minor progression (e.g. C, Bb, F#).')
     parser.add_argument('-g', '--generate', type=int,
                         help='Generate a minor progression with the given length.')
+    parser.add_argument('-w', '--weighted', action='store_true',
+                        help='Prefer the more common transitions when generating.')
     parser.add_argument('-p', '--play', action='store_true',
                         help='Play the generated minor progression.')
     args = parser.parse_args()
@@ -152,12 +153,14 @@ if __name__ == '__main__':
         p = MinorProgression()
 
     if args.generate:
-        progression = p.generate(args.generate)
+        progression = p.generate(args.generate, weighted=args.weighted)
         progression.show()
     else:
         p.show()
 
     if args.play and args.generate and args.root:
+        from musicmaker.sound.staffplayer import StaffPlayer
+
         print('looping..', flush=True)
         player = StaffPlayer(progression)
         player.add_sound(1, player.synth.chime)
@@ -0,0 +1,124 @@
+import numpy
+
+from .staff import Staff
+from .pitch import Pitch
+from .pitch_array import PitchArray
+
+NOTE_DTYPE = numpy.dtype([
+    ('midi', numpy.int16),
+    ('onset', numpy.float64),  # in beats
+    ('duration', numpy.float64),  # in beats
+    ('line', numpy.int32),  # index into NoteTable.lines
+    ('velocity', numpy.float32),
+])
+
+# Beats closer than this are the same beat, as stretching and slicing leave onsets a rounding error off
+BEAT_TOLERANCE = 1e-9
+
+
+class NoteTable:
+    # One row per note instead of a Pitch object per note, rests are the gaps between rows
+    def __init__(self, notes=None, lines=None, tempo=120, tuning=440, loop=False, meter_beats=0, meter_base=0):
+        self.notes = numpy.zeros(0, dtype=NOTE_DTYPE) if notes is None else numpy.asarray(notes, dtype=NOTE_DTYPE)
+        self.lines = [] if lines is None else list(lines)
+        self.tempo = tempo
+        self.tuning = tuning
+        self.loop = loop
+        self.meter_beats = meter_beats
+        self.meter_base = meter_base
+
+    def __len__(self):
+        return len(self.notes)
+
+    @property
+    def nbytes(self):
+        return self.notes.nbytes
+
+    @property
+    def total_beats(self):
+        if len(self.notes) == 0:
+            return 0
+        return float(numpy.max(self.notes['onset'] + self.notes['duration']))
+
+    def pitch_array(self):
+        return PitchArray(self.notes['midi'], self.tuning)
+
+    # A table with the same lines and settings holding other notes
+    def with_notes(self, notes):
+        return NoteTable(notes, self.lines, self.tempo, self.tuning, self.loop, self.meter_beats, self.meter_base)
+
+    @staticmethod
+    def from_staff(staff, velocity=1.0):
+        lines = list(staff.lines)
+        line_ids = {key: i for i, key in enumerate(lines)}
+        tuning = None
+
+        rows = []
+        for event in staff.index():
+            for note in event.notes:
+                if hasattr(note, 'value'):
+                    rows.append((note.value, event.onset, event.length, line_ids[event.line], velocity))
+                    if tuning is None:
+                        tuning = note.tuning
+
+        return NoteTable(numpy.array(rows, dtype=NOTE_DTYPE), lines, staff.tempo, tuning or 440, staff.loop,
+                         staff.meter_beats, staff.meter_base)
+
+    def to_staff(self):
+        staff = Staff(self.loop, self.tempo, self.meter_beats, self.meter_base)
+        notes = self.notes[numpy.lexsort((self.notes['duration'], self.notes['onset'], self.notes['line']))]
+
+        # Rows of a line starting together are one note group, or several when their lengths differ
+        starts = numpy.flatnonzero((notes['line'][1:] != notes['line'][:-1]) |
+                                   (numpy.diff(notes['onset']) > BEAT_TOLERANCE)) + 1
+        for group in numpy.split(notes, starts):
+            if len(group) == 0:
+                continue
+            line = self.lines[group['line'][0]]
+            onset = float(group['onset'][0])
+
+            gap = onset - (staff.lines[line].total_beats if line in staff.lines else 0)
+            if gap < -BEAT_TOLERANCE:
+                raise ValueError(f"Notes overlap on line {line} at beat {onset}")
+            if gap > BEAT_TOLERANCE:
+                staff.add([], gap, line)
+
+            pitches = [Pitch.create(tuning=self.tuning, midi=int(midi)) for midi in group['midi']]
+            durations = same_lengths(group['duration'])
+            if numpy.all(durations == durations[0]):
+                staff.add(pitches, float(durations[0]), line)
+            else:
+                staff.add_multi_length([(pitch, float(duration)) for pitch, duration in zip(pitches, durations)], line)
+
+        return staff
+
+    def transpose(self, steps=1):
+        notes = self.notes.copy()
+        notes['midi'] += steps
+        return self.with_notes(notes)
+
+    def stretch(self, factor):
+        notes = self.notes.copy()
+        notes['onset'] *= factor
+        notes['duration'] *= factor
+        return self.with_notes(notes)
+
+    # The notes starting in [start, stop), moved so that start becomes beat 0
+    def slice(self, start=0, stop=None):
+        onsets = self.notes['onset']
+        mask = onsets >= start - BEAT_TOLERANCE
+        if stop is not None:
+            mask &= onsets < stop - BEAT_TOLERANCE
+        notes = self.notes[mask]
+        notes['onset'] -= start
+        return self.with_notes(notes)
+
+
+# Lengths within the tolerance of a shorter one made equal to it, so they share a note group
+def same_lengths(durations):
+    durations = durations.copy()
+    order = numpy.argsort(durations, kind='stable')
+    for previous, current in zip(order[:-1], order[1:]):
+        if durations[current] - durations[previous] <= BEAT_TOLERANCE:
+            durations[current] = durations[previous]
+    return durations
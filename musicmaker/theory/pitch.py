@@ -24,29 +24,84 @@ def freq_equal_temperament(n, base_freq):
     return base_freq * 2.0**((n-69)/12.0)
 
 
+# 12 bit set of the pitch classes among pitches, C being bit 0
+def pitch_class_mask(pitches):
+    mask = 0
+    for pitch in pitches:
+        if hasattr(pitch, 'value'):
+            mask |= 1 << pitch.value % 12
+    return mask
+
+
+def rotate_mask(mask, steps):
+    steps %= 12
+    return ((mask << steps) | (mask >> (12 - steps))) & 0xfff
+
+
+@functools.lru_cache(4096)
+def intern_pitch(name, octave, tuning):
+    return Pitch(name, octave, tuning)
+
+
+# Cached on the arguments as given, so a hit such as Pitch.transpose's is one lookup.
+# Misses share one instance per spelled pitch and tuning, midi pitches getting the flat-based spelling's instance
+@functools.lru_cache(4096)
+def create_pitch(name='C', octave=4, tuning=440, midi=None):
+    if midi is not None:
+        name = REV_NOTE_MAP[midi % 12]
+        octave = midi // 12 - 1
+    return intern_pitch(name, octave, tuning)
+
+
 class Pitch:
-    @functools.lru_cache(256)
-    def create(name='C', octave=4, tuning=440, midi=None):
-        return Pitch(name, octave, tuning, midi)
+    __slots__ = ('name', 'octave', 'tuning', 'value')
+
+    create = staticmethod(create_pitch)
+
+    @staticmethod
+    def cache_info():
+        return create_pitch.cache_info()
+
+    @staticmethod
+    def hit_rate():
+        info = create_pitch.cache_info()
+        total = info.hits + info.misses
+        return info.hits / total if total else 0.0
 
     def __init__(self, name='C', octave=4, tuning=440, midi=None):
         if midi is None:
-            self.name = name
-            self.octave = octave
-            self.tuning = tuning
-            self.value = NOTE_MAP[name]+12*octave
+            value = NOTE_MAP[name]+12*octave
         else:
-            self.value = midi
-            self.tuning = tuning
-            self.octave = math.floor(midi / 12) - 1
-            self.name = REV_NOTE_MAP[midi % 12]
+            value = midi
+            octave = math.floor(midi / 12) - 1
+            name = REV_NOTE_MAP[midi % 12]
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'octave', octave)
+        object.__setattr__(self, 'tuning', tuning)
+        object.__setattr__(self, 'value', value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError(f"Pitch is immutable, can't set {key}")
+
+    def __delattr__(self, key):
+        raise AttributeError(f"Pitch is immutable, can't delete {key}")
+
+    def __reduce__(self):
+        return Pitch, (self.name, self.octave, self.tuning)
 
     def __str__(self):
         return self.name + str(self.octave)
     __repr__ = __str__
 
+    # Equal pitches are equal whatever their spelling or tuning
     def __eq__(self, other):
-        return self.value == other.value
+        try:
+            return self.value == other.value
+        except AttributeError:
+            return NotImplemented
+
+    def __hash__(self):
+        return hash(self.value)
 
     def note_kind_equals(self, other):
         return self.value % 12 == other.value % 12
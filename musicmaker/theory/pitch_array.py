@@ -0,0 +1,79 @@
+import functools
+import numpy
+
+from .pitch import Pitch, REV_NOTE_MAP, SHARP_NOTE_MAP, freq_equal_temperament
+
+FLAT_NAMES = numpy.array([REV_NOTE_MAP[i] for i in range(12)])
+SHARP_NAMES = numpy.array([SHARP_NOTE_MAP[i] for i in range(12)])
+
+
+# Equal temperament frequencies of MIDI notes 0-127, bit for bit what Pitch.freq gives
+@functools.lru_cache(64)
+def frequency_table(tuning=440):
+    table = numpy.array([freq_equal_temperament(n, tuning) for n in range(128)])
+    table.flags.writeable = False
+    return table
+
+
+class PitchArray:
+    # Many pitches of one tuning as MIDI numbers, for bulk work where Pitch objects are too costly
+    def __init__(self, midi, tuning=440):
+        self.midi = numpy.asarray(midi, dtype=numpy.int16).reshape(-1)
+        self.tuning = tuning
+
+    @staticmethod
+    def from_pitches(pitches, tuning=None):
+        pitches = [pitch for pitch in pitches if hasattr(pitch, 'value')]
+        if tuning is None:
+            tuning = pitches[0].tuning if pitches else 440
+        return PitchArray([pitch.value for pitch in pitches], tuning)
+
+    def __len__(self):
+        return len(self.midi)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, numpy.integer)):
+            return Pitch.create(tuning=self.tuning, midi=int(self.midi[key]))
+        return PitchArray(self.midi[key], self.tuning)
+
+    def __iter__(self):
+        for midi in self.midi:
+            yield Pitch.create(tuning=self.tuning, midi=int(midi))
+
+    def __str__(self):
+        return str(list(self.names()))
+    __repr__ = __str__
+
+    def to_pitches(self):
+        return list(self)
+
+    @property
+    def octaves(self):
+        return self.midi // 12 - 1
+
+    @property
+    def pitch_classes(self):
+        return self.midi % 12
+
+    # Steps may be a number or an array with one step per pitch
+    def transpose(self, steps=1):
+        return PitchArray(self.midi + numpy.asarray(steps, dtype=numpy.int16), self.tuning)
+
+    def raise_octave(self, steps=1):
+        return self.transpose(numpy.asarray(steps, dtype=numpy.int16) * 12)
+
+    def set_octave(self, octave):
+        return PitchArray(self.pitch_classes + (numpy.asarray(octave, dtype=numpy.int16) + 1) * 12, self.tuning)
+
+    # Names like str(Pitch), flat-based unless sharp is set
+    def names(self, sharp=False):
+        names = (SHARP_NAMES if sharp else FLAT_NAMES)[self.pitch_classes]
+        return numpy.char.add(names, self.octaves.astype(str))
+
+    # Equal tempered for the reference pitch, unless a Tuning is given
+    def freqs(self, tuning=None):
+        if tuning is not None:
+            return tuning.freqs(self.midi)
+        if len(self.midi) == 0 or (self.midi.min() >= 0 and self.midi.max() < 128):
+            return frequency_table(self.tuning)[self.midi]
+        return numpy.array([freq_equal_temperament(int(n), self.tuning) for n in self.midi])
@@ -5,6 +5,11 @@ from .chord import Chord
 from .progression import Progression
 
 
+# Lower weights are more usual transitions, so PRIMARY is picked 17 times as often as RARE
+def inverse_weight(weight):
+    return 1.0 / (1.0 + weight)
+
+
 class ProgressionGenerator(WeightedDigraph):
     position_dict = {}
 
@@ -85,13 +90,17 @@ class ProgressionGenerator(WeightedDigraph):
     def set_scale(self, scale):
         self.scale = scale
 
-    def generate(self, length=4, loop=True, ext=True):
+    # Uniform over the neighbors unless weighted, then following probability(weight) of each edge
+    def generate(self, length=4, loop=True, ext=True, weighted=False, probability=inverse_weight):
         p = Progression(loop=loop, tempo=60)
         cur = self.start
         p.add(cur.value.get_base_chord(self.scale))
         for i in range(length-1):
-            next = random.randint(0, cur.outdegree()-1)
-            cur = cur.neighbors()[next]
+            if weighted:
+                cur = cur.sample(probability)
+            else:
+                next = random.randint(0, cur.outdegree()-1)
+                cur = cur.neighbors()[next]
             if ext:
                 p.add(cur.value.get_random_adjusted_chord(self.scale))
             else:
@@ -1,4 +1,4 @@
-import methodtools
+import functools
 import argparse
 import random
 import sys
@@ -31,7 +31,7 @@ class Scale:
             else:
                 self.descending = descending
 
-        @methodtools.lru_cache(16)
+        @functools.lru_cache(1024)
         def find_step(self, pos):
             if pos == 0:
                 return 0
@@ -59,6 +59,31 @@ class Scale:
 
                 return step + self.descending[pos] - 12
 
+        # Read-only ascending and descending step arrays, built on first use
+        @functools.lru_cache(1024)
+        def step_tables(self):
+            import numpy
+
+            ascending = numpy.array(self.ascending, dtype=numpy.int64)
+            descending = numpy.array(self.descending, dtype=numpy.int64)
+            ascending.flags.writeable = False
+            descending.flags.writeable = False
+            return ascending, descending
+
+        # find_step for a whole array of positions at once
+        def find_steps(self, positions):
+            import numpy
+
+            ascending, descending = self.step_tables()
+            positions = numpy.asarray(positions, dtype=numpy.int64)
+
+            up = numpy.maximum(positions, 1) - 1
+            down = numpy.maximum(-positions, 1) - 1
+            steps = numpy.where(positions > 0,
+                                up // len(ascending) * 12 + ascending[up % len(ascending)],
+                                down // len(descending) * -12 + descending[down % len(descending)] - 12)
+            return numpy.where(positions == 0, 0, steps)
+
     modes = {
         'Ionian':     Mode('Ionian', [0, 2, 4, 5, 7, 9, 11]),
         'Dorian':     Mode('Dorian', [0, 2, 3, 5, 7, 9, 10]),
@@ -163,10 +188,21 @@ class Scale:
     def get_pitch(self, num):
         return self.root.transpose(self.mode.find_step(num))
 
+    # MIDI numbers of an array of degrees, like get_pitch(num).value for each
+    def get_midi(self, nums):
+        return self.root.value + self.mode.find_steps(nums)
+
+    # The pitches of the given degrees, by default one octave up from the root, as one PitchArray
+    def pitch_array(self, nums=None):
+        from .pitch_array import PitchArray
+
+        if nums is None:
+            nums = range(1, len(self)+2)
+        return PitchArray(self.get_midi(list(nums)), self.root.tuning)
+
 
 if __name__ == '__main__':
 
-    from musicmaker.sound.staffplayer import StaffPlayer
     from .staff import Staff
 
     parser = argparse.ArgumentParser(
@@ -201,6 +237,8 @@ if __name__ == '__main__':
     scale.show()
 
     if args.play and args.root:
+        from musicmaker.sound.staffplayer import StaffPlayer
+
         staff = Staff()
         for i in range(1, len(scale)+2):
             staff.add([scale.get_pitch(i)], 1)
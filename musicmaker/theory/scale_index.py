@@ -0,0 +1,90 @@
+import collections
+import functools
+import numpy
+
+from .pitch import REV_NOTE_MAP, pitch_class_mask, rotate_mask
+from .scale import Scale
+
+# Number of set bits of every 12 bit mask
+POPCOUNT = numpy.array([bin(mask).count('1') for mask in range(4096)], dtype=numpy.int8)
+
+# missing: notes of the query outside the scale, extra: notes of the scale not in the query
+ScaleMatch = collections.namedtuple('ScaleMatch', ['root', 'mode', 'missing', 'extra'])
+
+
+# Pitch classes of a mode on C, either way it is played
+def mode_mask(mode):
+    return sum(1 << step for step in set(mode.ascending) | set(mode.descending))
+
+
+class ScaleIndex:
+    # One 12 bit mask per root and mode, so each query is a few array operations over all of them
+    def __init__(self, modes=None):
+        modes = Scale.modes if modes is None else modes
+        self.roots = []
+        self.modes = []
+        masks = []
+        for name in modes:
+            mask = mode_mask(modes[name])
+            for root in range(12):
+                self.roots.append(REV_NOTE_MAP[root])
+                self.modes.append(name)
+                masks.append(rotate_mask(mask, root))
+        self.masks = numpy.array(masks, dtype=numpy.int64)
+
+    @staticmethod
+    @functools.lru_cache(1)
+    def default():
+        return ScaleIndex()
+
+    def __len__(self):
+        return len(self.masks)
+
+    def scale(self, i):
+        return Scale(self.roots[i], self.modes[i])
+
+    # Sets are pitch collections or masks from pitch_class_mask
+    @staticmethod
+    def query_masks(sets):
+        return numpy.array([s if isinstance(s, (int, numpy.integer)) else pitch_class_mask(s) for s in sets],
+                           dtype=numpy.int64)
+
+    # Both shaped (sets x scales)
+    def missing(self, masks):
+        return POPCOUNT[masks.reshape(-1, 1) & ~self.masks & 0xfff]
+
+    def extra(self, masks):
+        return POPCOUNT[self.masks & ~masks.reshape(-1, 1) & 0xfff]
+
+    def matches(self, order, missing, extra, limit=None):
+        return [ScaleMatch(self.roots[i], self.modes[i], int(missing[i]), int(extra[i])) for i in order[:limit]]
+
+    # Scales holding every pitch class of pitches, in the order of Scale.modes
+    def containing(self, pitches):
+        masks = self.query_masks([pitches])
+        missing, extra = self.missing(masks)[0], self.extra(masks)[0]
+        return self.matches(numpy.flatnonzero(missing == 0), missing, extra)
+
+    # Scales holding every pitch class of pitches with the fewest notes to spare
+    def best_fit(self, pitches, limit=None):
+        masks = self.query_masks([pitches])
+        missing, extra = self.missing(masks)[0], self.extra(masks)[0]
+        contained = numpy.flatnonzero(missing == 0)
+        return self.matches(contained[numpy.argsort(extra[contained], kind='stable')], missing, extra, limit)
+
+    # Scales closest to pitches counting notes either one lacks, fewer notes missing from the scale breaking ties
+    def nearest(self, pitches, limit=None):
+        masks = self.query_masks([pitches])
+        missing, extra = self.missing(masks)[0], self.extra(masks)[0]
+        return self.matches(numpy.lexsort((missing, missing + extra)), missing, extra, limit)
+
+    # Booleans shaped (sets x scales) for which scales hold which set
+    def containing_many(self, sets):
+        return self.missing(self.query_masks(sets)) == 0
+
+    # Index of the nearest scale for every set, see nearest and scale
+    def nearest_many(self, sets):
+        masks = self.query_masks(sets)
+        missing = self.missing(masks).astype(numpy.int32)
+        distance = (missing + self.extra(masks)) * 16 + missing
+        return numpy.argmin(distance, axis=1)
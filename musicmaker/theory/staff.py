@@ -1,7 +1,13 @@
+import bisect
+import collections
+from operator import attrgetter
+
+
 class Staff:
     class Line:
         def __init__(self):
             self.note_groups = []  # array of ([pitch], length) pairs
+            self.onsets = []  # beat each note group starts on, sorted as groups only ever go at the end
             self.total_beats = 0
             self.cur_index = 0
             self.cur_beat = 0
@@ -10,9 +16,26 @@ class Staff:
             return str(self.note_groups)
 
         def add(self, notes, length):
+            self.onsets.append(self.total_beats)
             self.total_beats += length
             self.note_groups.append((notes, length))
 
+        # Indices of the note groups overlapping [start, stop), found by bisection as groups never overlap
+        def overlapping(self, start, stop):
+            if stop <= start:
+                return range(0)
+            first = bisect.bisect_right(self.onsets, start) - 1
+            if first < 0 or self.onsets[first] + self.note_groups[first][1] <= start:
+                first += 1
+            return range(first, bisect.bisect_left(self.onsets, stop, first))
+
+        # Index of the note group sounding at beat, or None
+        def sounding(self, beat):
+            i = bisect.bisect_right(self.onsets, beat) - 1
+            if i >= 0 and beat < self.onsets[i] + self.note_groups[i][1]:
+                return i
+            return None
+
         def restart(self):
             self.cur_index = 0
             self.cur_beat = 0
@@ -30,9 +53,7 @@ class Staff:
 
         def catch_up(self, target_beats):
             if target_beats > self.total_beats:
-                length = target_beats - self.total_beats
-                self.total_beats += length
-                self.note_groups.append((['z'], length))
+                self.add(['z'], target_beats - self.total_beats)
 
     def __init__(self, loop=False, tempo=120, meter_beats=0, meter_base=0):
         self.loop = loop
@@ -41,6 +62,7 @@ class Staff:
         self.meter_base = meter_base
         self.lines = {}
         self.total_beats = 0
+        self.compiled_index = None
 
     # length in number of beats
     def add(self, notes, length=1, line=1):
@@ -50,6 +72,7 @@ class Staff:
         if line not in self.lines:
             self.lines[line] = self.Line()
 
+        self.compiled_index = None
         self.lines[line].add(notes, length)
 
         if self.lines[line].total_beats > self.total_beats:
@@ -74,6 +97,7 @@ class Staff:
         if line not in self.lines:
             self.lines[line] = self.Line()
 
+        self.compiled_index = None
         for i, note_group in enumerate(note_lines[1:]):
             line_key = 'multi_length'+str(line)+'.'+str(i)
             while line_key in self.lines and self.lines[line_key].total_beats > self.lines[line].total_beats:
@@ -94,8 +118,40 @@ class Staff:
         if self.lines[line].total_beats > self.total_beats:
             self.total_beats = self.lines[line].total_beats
 
+    # A read-only view of the staff ordered by onset, compiled again after the staff changes
+    def index(self):
+        if self.compiled_index is None:
+            self.compiled_index = StaffIndex(self)
+        return self.compiled_index
+
+    # Events sounding at beat, line by line, in O(lines * log n + k) without iterating the staff
+    def sounding(self, beat, rests=False):
+        events = []
+        for key in self.lines:
+            i = self.lines[key].sounding(beat)
+            if i is not None:
+                events.append(self.event(key, i))
+        return [event for event in events if rests or event.sounding()]
+
+    # Events overlapping [start, stop), line by line and in order of onset within each line
+    def overlapping(self, start, stop, rests=False):
+        events = [self.event(key, i) for key in self.lines for i in self.lines[key].overlapping(start, stop)]
+        return [event for event in events if rests or event.sounding()]
+
+    # Every pitch of the staff in order of onset, as one PitchArray
+    def pitch_array(self):
+        from .pitch_array import PitchArray
+
+        return PitchArray.from_pitches([note for event in self.index() for note in event.notes])
+
+    def event(self, key, i):
+        line = self.lines[key]
+        notes, length = line.note_groups[i]
+        return StaffEvent(line.onsets[i], length, key, tuple(notes))
+
     def __iter__(self):
         self.cur_beat = 0
+        self.compiled_index = None
         for key in self.lines:
             if self.lines[key].total_beats > self.total_beats:
                 self.total_beats = self.lines[key].total_beats
@@ -143,3 +199,66 @@ class Staff:
             print(beat, notes)
             beat += min_beat
         print(beat, 'END')
+
+
+class StaffEvent(collections.namedtuple('StaffEvent', ['onset', 'length', 'line', 'notes'])):
+    __slots__ = ()
+
+    @property
+    def end(self):
+        return self.onset + self.length
+
+    # Rests are note groups without any pitch, such as [] or ['z']
+    def sounding(self):
+        return any(hasattr(note, 'value') for note in self.notes)
+
+
+class StaffIndex:
+    # Unlike iterating the staff itself, nothing here moves cursors or pads lines with rests,
+    # so any number of iterators can run over the same index at once
+    def __init__(self, staff):
+        self.tempo = staff.tempo
+        self.line_onsets = {}
+        self.line_events = {}
+        for key in staff.lines:
+            line = staff.lines[key]
+            self.line_events[key] = tuple(staff.event(key, i) for i in range(len(line.note_groups)))
+            self.line_onsets[key] = tuple(line.onsets)
+
+        # The sort is stable, so events with the same onset stay in line order
+        self.events = tuple(sorted((event for key in self.line_events for event in self.line_events[key]),
+                                   key=attrgetter('onset')))
+        self.onsets = tuple(event.onset for event in self.events)
+        self.total_beats = max([line.total_beats for line in staff.lines.values()] + [0])
+
+    def __len__(self):
+        return len(self.events)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    # Position of the first event starting at or after beat, in the merged timeline or one line
+    def seek(self, beat, line=None):
+        onsets = self.onsets if line is None else self.line_onsets[line]
+        return bisect.bisect_left(onsets, beat)
+
+    # Yields the events starting in [start, stop)
+    def events_between(self, start=0, stop=None, line=None):
+        events = self.events if line is None else self.line_events[line]
+        onsets = self.onsets if line is None else self.line_onsets[line]
+        end = len(events) if stop is None else bisect.bisect_left(onsets, stop)
+        for i in range(self.seek(start, line), end):
+            yield events[i]
+
+    # Yields (onset, {line: (notes, length)}) for every onset in [start, stop), like iterating the staff
+    def groups(self, start=0, stop=None):
+        onset = None
+        group = {}
+        for event in self.events_between(start, stop):
+            if event.onset != onset and group:
+                yield onset, group
+                group = {}
+            onset = event.onset
+            group[event.line] = (list(event.notes), event.length)
+        if group:
+            yield onset, group
@@ -0,0 +1,128 @@
+import functools
+import math
+import numpy
+
+from .pitch import NOTE_MAP, freq_equal_temperament
+
+# 5-limit just ratios above the tonic, by semitone
+JUST_RATIOS = [1, 16/15, 9/8, 6/5, 5/4, 4/3, 45/32, 3/2, 8/5, 5/3, 9/5, 15/8]
+PURE_FIFTH_CENTS = 1200.0 * math.log2(3 / 2)
+SYNTONIC_COMMA_CENTS = 1200.0 * math.log2(81 / 80)
+
+
+def ratio_cents(ratio):
+    return 1200.0 * math.log2(ratio)
+
+
+# Frequencies of MIDI notes 0-127, compiled once per distinct tuning
+@functools.lru_cache(64)
+def compile_tuning(cents, period, tonic, reference):
+    steps = numpy.arange(128) - tonic
+    octaves, degrees = numpy.divmod(steps, len(cents))
+    offsets = octaves * period + numpy.asarray(cents)[degrees]
+    table = freq_equal_temperament(tonic, reference) * 2.0 ** (offsets / 1200.0)
+    table.flags.writeable = False
+    return table
+
+
+class Tuning:
+    # cents: each degree above the tonic, starting with 0, repeating every period cents from the tonic.
+    # The tonic (a MIDI number) keeps its equal tempered frequency for the reference pitch A4 = reference Hz
+    def __init__(self, name, cents, period=1200.0, tonic=60, reference=440):
+        if len(cents) == 0 or cents[0] != 0:
+            raise ValueError(f"Tuning {name} needs cents starting at 0 for the tonic, got {cents}")
+        self.name = name
+        self.cents = tuple(float(cent) for cent in cents)
+        self.period = float(period)
+        self.tonic = tonic_midi(tonic)
+        self.reference = reference
+
+    def __str__(self):
+        return self.name
+    __repr__ = __str__
+
+    def __eq__(self, other):
+        return isinstance(other, Tuning) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def key(self):
+        return self.cents, self.period, self.tonic, self.reference
+
+    def __len__(self):
+        return len(self.cents)
+
+    def table(self):
+        return compile_tuning(*self.key())
+
+    def freq(self, midi):
+        if 0 <= midi < 128:
+            return float(self.table()[midi])
+        octave, degree = divmod(midi - self.tonic, len(self.cents))
+        return freq_equal_temperament(self.tonic, self.reference) * 2.0 ** (
+            (octave * self.period + self.cents[degree]) / 1200.0)
+
+    def freqs(self, midi):
+        midi = numpy.asarray(midi)
+        if midi.size == 0 or (midi.min() >= 0 and midi.max() < 128):
+            return self.table()[midi]
+        return numpy.vectorize(self.freq, otypes=[numpy.float64])(midi)
+
+    @staticmethod
+    def equal(tonic=60, reference=440):
+        return Tuning('Equal', [100.0 * i for i in range(12)], 1200.0, tonic, reference)
+
+    @staticmethod
+    def just(tonic=60, reference=440):
+        return Tuning('Just', [ratio_cents(ratio) for ratio in JUST_RATIOS], 1200.0, tonic, reference)
+
+    # Fifths narrowed by a fraction of the syntonic comma, a quarter gives pure major thirds
+    @staticmethod
+    def meantone(tonic=60, reference=440, comma_fraction=0.25, name='Meantone'):
+        fifth = PURE_FIFTH_CENTS - comma_fraction * SYNTONIC_COMMA_CENTS
+        cents = [0.0] * 12
+        # Three fifths down to eight up, i.e. Eb to G# in C as on meantone keyboards
+        for fifths in range(-3, 9):
+            cents[fifths * 7 % 12] = fifths * fifth % 1200.0
+        return Tuning(name, cents, 1200.0, tonic, reference)
+
+    @staticmethod
+    def pythagorean(tonic=60, reference=440):
+        return Tuning.meantone(tonic, reference, 0.0, 'Pythagorean')
+
+    @staticmethod
+    def from_cents(cents, period=1200.0, tonic=60, reference=440, name='Cents'):
+        return Tuning(name, cents, period, tonic, reference)
+
+    # Scala files list every degree above the tonic, the last being the period, see www.huygens-fokker.org/scala
+    @staticmethod
+    def from_scala(file, tonic=60, reference=440):
+        if isinstance(file, str):
+            with open(file) as f:
+                return Tuning.from_scala(f, tonic, reference)
+
+        lines = [line.strip() for line in file if not line.startswith('!')]
+        name = lines[0] or 'Scala'
+        count = int(lines[1].split()[0])
+        pitches = [scala_cents(line) for line in lines[2:2 + count]]
+        if len(pitches) != count:
+            raise ValueError(f"Scala tuning {name} promises {count} pitches but has {len(pitches)}")
+        return Tuning(name, [0.0] + pitches[:-1], pitches[-1], tonic, reference)
+
+
+def tonic_midi(tonic):
+    if isinstance(tonic, str):
+        return NOTE_MAP[tonic] + 12 * 4
+    return getattr(tonic, 'value', tonic)
+
+
+# Pitches with a period are in cents, others are ratios such as 3/2 or plain integers such as 2
+def scala_cents(line):
+    value = line.split()[0]
+    if '.' in value:
+        return float(value)
+    if '/' in value:
+        numerator, denominator = value.split('/')
+        return ratio_cents(int(numerator) / int(denominator))
+    return ratio_cents(int(value))